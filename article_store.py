@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite article store with a full-text index
+
+- One row per article link (unique index), so articles found under several
+  keywords or re-crawled are stored once; keyword/quarter memberships live
+  in a separate table indexed by (keyword, quarter)
+- Indexes on date and source; FTS5 index over title and contents kept in
+  sync by triggers (trigram tokenizer, so Korean substrings match, e.g.
+  "윤리" in "윤리적"; unicode61 on SQLite builds without trigram)
+- Written by the crawler with `main.py --store PATH` next to the CSV
+  output; existing CSV/Parquet outputs can be imported
+- A quarter merge is one indexed query (see merge_csv_by_quarter.py --store)
+
+Query CLI:
+    python article_store.py out/articles.sqlite search 인공지능 --quarter 24Q1 --source 연합뉴스
+    python article_store.py out/articles.sqlite stats
+    python article_store.py out/articles.sqlite import out/*.csv
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Iterator, List, Optional
+
+from result_catalog import parse_result_name
+from row_writer import COLUMNS, parse_date_text, read_csv_rows
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency, only needed to import parquet files
+    pq = None
+
+DEFAULT_LIMIT = 20
+_IMPORT_BATCH = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY, link TEXT NOT NULL, date TEXT, date_text TEXT,
+    title TEXT, source TEXT, contents TEXT, added_at REAL);
+CREATE UNIQUE INDEX IF NOT EXISTS articles_link ON articles(link);
+CREATE INDEX IF NOT EXISTS articles_date ON articles(date);
+CREATE INDEX IF NOT EXISTS articles_source ON articles(source, date);
+CREATE TABLE IF NOT EXISTS article_keywords (
+    article_id INTEGER NOT NULL, keyword TEXT NOT NULL, quarter TEXT NOT NULL,
+    PRIMARY KEY (keyword, quarter, article_id)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS article_keywords_quarter ON article_keywords(quarter, article_id);
+CREATE INDEX IF NOT EXISTS article_keywords_article ON article_keywords(article_id);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, contents) VALUES (new.id, new.title, new.contents);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, contents) VALUES ('delete', old.id, old.title, old.contents);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, contents ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, contents) VALUES ('delete', old.id, old.title, old.contents);
+    INSERT INTO articles_fts(rowid, title, contents) VALUES (new.id, new.title, new.contents);
+END;
+"""
+
+
+def _fts_tokenizer(db: sqlite3.Connection) -> str:
+    try:
+        db.execute("CREATE VIRTUAL TABLE temp.trigram_probe USING fts5(x, tokenize='trigram')")
+        db.execute("DROP TABLE temp.trigram_probe")
+        return "trigram"
+    except sqlite3.OperationalError:  # SQLite < 3.34
+        return "unicode61"
+
+
+def resolve_date(text: str, reference: datetime.datetime) -> Optional[str]:
+    """ISO date of a crawled date string; relative dates are resolved against `reference`."""
+    value = parse_date_text(text or "")
+    if isinstance(value, datetime.timedelta):
+        value = (reference - value).date()
+    return value.isoformat() if value is not None else None
+
+
+def _fts_phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+class ArticleStore:
+    """SQLite store of crawled articles.
+
+    Args:
+        path (str): Database file (created on first use).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        # shared by crawl threads; several crawler processes may write to one store
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        exists = self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'").fetchone() is not None
+        if not exists:
+            self._db.execute("CREATE VIRTUAL TABLE articles_fts USING fts5(title, contents, "
+                             f"content='articles', content_rowid='id', tokenize='{_fts_tokenizer(self._db)}')")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self.tokenizer = self._db.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'articles_fts'").fetchone()[0]
+
+    def add_rows(self, rows: List[dict], keyword: str, quarter: str,
+                 reference: Optional[datetime.datetime] = None) -> int:
+        """Store crawled rows under a keyword and quarter ("24Q1").
+
+        A link already stored keeps its row (its contents are filled in if
+        they were empty) and only gains the keyword membership.
+
+        Args:
+            rows (list): Row dicts with the columns of row_writer.COLUMNS.
+            keyword (str): Search keyword the rows were found with.
+            quarter (str): Quarter label of the crawl ("24Q1").
+            reference (datetime): Crawl time for relative dates (default: now).
+
+        Returns:
+            int: Number of new articles.
+        """
+        reference = reference or datetime.datetime.now()
+        now = time.time()
+        records = [(row["link"], resolve_date(row.get("date", ""), reference), row.get("date", ""),
+                    row.get("title", ""), row.get("source", ""), row.get("contents", ""), now)
+                   for row in rows if row.get("link")]
+        if not records:
+            return 0
+        with self._lock:
+            # rowcount only counts rows of the statement itself, not the FTS trigger writes
+            added = self._db.executemany(
+                "INSERT OR IGNORE INTO articles (link, date, date_text, title, source, contents, added_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)", records).rowcount
+            self._db.executemany(
+                "UPDATE articles SET contents = ? WHERE link = ? AND contents = '' AND ? != ''",
+                [(record[5], record[0], record[5]) for record in records if record[5]])
+            self._db.executemany(
+                "INSERT OR IGNORE INTO article_keywords (article_id, keyword, quarter)"
+                " SELECT id, ?, ? FROM articles WHERE link = ?",
+                [(keyword, quarter, record[0]) for record in records])
+            self._db.commit()
+        return added
+
+    def import_file(self, path: str) -> int:
+        """Import a crawler output file named {YY}Q{n}_{keyword}.{csv|parquet} (see `add_rows`)."""
+        info = parse_result_name(os.path.basename(path))
+        if info is None:
+            raise ValueError(f"not a crawler output file name: {path}")
+        reference = datetime.datetime.fromtimestamp(os.path.getmtime(path))
+        if path.endswith(".parquet"):
+            if pq is None:
+                raise SystemExit("parquet 파일을 읽으려면 pyarrow가 필요합니다: pip install pyarrow")
+            rows = ({k: ("" if v is None else str(v)) for k, v in row.items()}
+                    for row in pq.read_table(path, columns=COLUMNS).to_pylist())
+        else:
+            rows = read_csv_rows(path)
+        added, batch = 0, []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= _IMPORT_BATCH:
+                added += self.add_rows(batch, info["keyword"], info["quarter"], reference)
+                batch = []
+        return added + self.add_rows(batch, info["keyword"], info["quarter"], reference)
+
+    def _query(self, text: Optional[str], quarter: Optional[str], keyword: Optional[str],
+               source: Optional[str], date_from: Optional[str], date_to: Optional[str]):
+        where, params = [], []
+        if text:
+            if len(text) >= 3 or "trigram" not in self.tokenizer:
+                where.append("a.id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+                params.append(_fts_phrase(text))
+            else:  # trigram needs 3 characters; shorter terms scan the rows left by the other filters
+                where.append("(a.title LIKE ? OR a.contents LIKE ?)")
+                params += [f"%{text}%"] * 2
+        if quarter or keyword:
+            sub = "SELECT article_id FROM article_keywords WHERE 1"
+            if quarter:
+                sub += " AND quarter = ?"
+                params.append(quarter)
+            if keyword:
+                sub += " AND keyword = ?"
+                params.append(keyword)
+            where.append(f"a.id IN ({sub})")
+        if source:
+            where.append("a.source = ?")
+            params.append(source)
+        if date_from:
+            where.append("a.date >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append("a.date <= ?")
+            params.append(date_to)
+        return " AND ".join(where) or "1", params
+
+    def search(self, text: Optional[str] = None, quarter: Optional[str] = None, keyword: Optional[str] = None,
+               source: Optional[str] = None, date_from: Optional[str] = None, date_to: Optional[str] = None,
+               limit: Optional[int] = DEFAULT_LIMIT) -> List[dict]:
+        """Articles matching every given filter, newest first.
+
+        Args:
+            text (str): Phrase to find in the title or contents (full-text index).
+            quarter (str): Quarter label ("24Q1").
+            keyword (str): Search keyword the article was crawled with.
+            source (str): Newspaper name.
+            date_from, date_to (str): ISO dates (inclusive).
+            limit (int): Maximum rows; None returns all.
+        """
+        where, params = self._query(text, quarter, keyword, source, date_from, date_to)
+        sql = (f"SELECT a.date, a.date_text, a.title, a.source, a.contents, a.link FROM articles a"
+               f" WHERE {where} ORDER BY a.date DESC, a.id")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            cur = self._db.execute(sql, params)
+            columns = [c[0] for c in cur.description]
+            return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+    def count(self, text: Optional[str] = None, quarter: Optional[str] = None, keyword: Optional[str] = None,
+              source: Optional[str] = None, date_from: Optional[str] = None, date_to: Optional[str] = None) -> int:
+        where, params = self._query(text, quarter, keyword, source, date_from, date_to)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM articles a WHERE {where}", params).fetchone()[0]
+
+    def quarter_rows(self, quarter: str, keyword: Optional[str] = None) -> Iterator[dict]:
+        """Stream a quarter's distinct articles newest first, as crawler rows ("YYYY.MM.DD." dates).
+
+        Rows are fetched on a separate connection so a long export does not
+        block writers.
+        """
+        where, params = self._query(None, quarter, keyword, None, None, None)
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            cur = db.execute(
+                f"SELECT a.date, a.date_text, a.title, a.source, a.contents, a.link FROM articles a"
+                f" WHERE {where} ORDER BY a.date DESC, a.id", params)
+            for date, date_text, title, source, contents, link in cur:
+                yield {"date": date.replace("-", ".") + "." if date else date_text, "title": title,
+                       "source": source, "contents": contents, "link": link}
+        finally:
+            db.close()
+
+    def stats(self) -> List[dict]:
+        """Per-quarter article counts (distinct links), keywords and date ranges."""
+        with self._lock:
+            cur = self._db.execute(
+                "SELECT k.quarter, COUNT(DISTINCT k.article_id) AS articles, COUNT(DISTINCT k.keyword) AS keywords,"
+                " MIN(a.date) AS date_min, MAX(a.date) AS date_max"
+                " FROM article_keywords k JOIN articles a ON a.id = k.article_id GROUP BY k.quarter ORDER BY k.quarter")
+            columns = [c[0] for c in cur.description]
+            return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def _print_rows(rows: List[dict], output: str, width: int) -> None:
+    if output == "jsonl":
+        for row in rows:
+            print(json.dumps(row, ensure_ascii=False))
+    elif output == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=["date", "date_text", "title", "source", "contents", "link"])
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            snippet = " ".join((row["contents"] or "").split())[:width]
+            print(f"{row['date'] or row['date_text']}  [{row['source']}] {row['title']}\n    {row['link']}\n    {snippet}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or fill the SQLite article store")
+    parser.add_argument("db", help="Article store file (main.py --store)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    search = commands.add_parser("search", help="Find articles (full-text phrase and/or filters)")
+    search.add_argument("text", nargs="?", help="Phrase to find in titles and contents")
+    search.add_argument("--quarter", help='Quarter label, e.g. "24Q1"')
+    search.add_argument("--keyword", help="Crawl keyword")
+    search.add_argument("--source", help="Newspaper name")
+    search.add_argument("--from", dest="date_from", help="First date (YYYY-MM-DD)")
+    search.add_argument("--to", dest="date_to", help="Last date (YYYY-MM-DD)")
+    search.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help=f"Maximum rows (default {DEFAULT_LIMIT})")
+    search.add_argument("--count", action="store_true", help="Only print the number of matches")
+    search.add_argument("--output", choices=["text", "jsonl", "csv"], default="text", help="Output format")
+    search.add_argument("--width", type=int, default=120, help="Contents snippet length for text output")
+    commands.add_parser("stats", help="Articles per quarter")
+    importer = commands.add_parser("import", help="Import crawler output files ({YY}Q{n}_{keyword}.csv)")
+    importer.add_argument("files", nargs="+")
+    args = parser.parse_args()
+
+    store = ArticleStore(args.db)
+    t0 = time.perf_counter()
+    if args.command == "search":
+        filters = dict(text=args.text, quarter=args.quarter, keyword=args.keyword, source=args.source,
+                       date_from=args.date_from, date_to=args.date_to)
+        if args.count:
+            print(store.count(**filters))
+        else:
+            _print_rows(store.search(limit=args.limit, **filters), args.output, args.width)
+    elif args.command == "stats":
+        for row in store.stats():
+            print(f"{row['quarter']}: {row['articles']} articles, {row['keywords']} keywords, "
+                  f"{row['date_min'] or '-'} ~ {row['date_max'] or '-'}")
+    else:
+        for path in args.files:
+            print(f"{path}: {store.import_file(path)} new articles")
+    print(f"({(time.perf_counter() - t0) * 1000:.1f} ms)", file=sys.stderr)
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
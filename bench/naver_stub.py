@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Local stand-in for the Naver search and article pages
+
+Serves pages built from the recorded templates in bench/fixtures so the
+crawler can be benchmarked without touching the real site.
+- Works as a plain HTTP proxy: point the crawler's session at it with
+  proxies={"http": stub.url} and use http:// search/article URLs
+- Configurable response latency (+ jitter) and 403 injection rate
+- Like the real pages, some result cards link only to the publisher's site
+  (no Naver News link), so they yield no crawled row
+- Pagination like the real site: `start` past the last result repeats the
+  last page (or returns an empty page), and the total count is shown as
+  "1-10 / N건"
+
+Run standalone:
+    python bench/naver_stub.py --port 8765 --results 300 --latency 0.05
+"""
+
+import argparse
+import functools
+import hashlib
+import os
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from typing import Dict, Optional
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Scheme/hosts the crawler must use so requests are routed through the stub
+SEARCH_URL = "http://search.naver.com/search.naver"
+ARTICLE_URL = "http://n.news.naver.com/mnews/article/{office}/{aid}"
+
+PAGE_SIZE = 10
+_SOURCES = ("연합뉴스", "한겨레", "조선일보", "중앙일보", "경향신문", "매일경제", "한국경제", "KBS")
+_SENTENCE = ("인공지능 기술의 윤리적 활용을 둘러싼 논의가 이어지고 있다. 전문가들은 개인정보 보호와 "
+             "투명성 확보가 무엇보다 중요하다고 강조했다. 관련 부처는 연내 가이드라인을 마련할 계획이다. ")
+
+
+@functools.lru_cache(maxsize=None)
+def _load(name: str) -> Template:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return Template(f.read())
+
+
+class StubConfig:
+    """Behaviour of the stub server.
+
+    Args:
+        results (int): Total search results per query.
+        latency (float): Seconds added to every response.
+        jitter (float): Random extra latency, uniform in [0, jitter] seconds.
+        error_rate (float): Probability of answering 403 instead of the page.
+        repeat_last_page (bool): Serve the last page again for `start` past
+            the end (the real site's behaviour); False serves an empty page.
+        show_total (bool): Include the "1-10 / N건" total count.
+        press_only_every (int): Every n-th result card links only to the
+            publisher's site (0: every card has a Naver News link).
+        article_paragraphs (int): Paragraphs per article body.
+        seed (int): Seed for the latency jitter and error injection.
+    """
+
+    def __init__(self, results: int = 200, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, repeat_last_page: bool = True, show_total: bool = True,
+                 press_only_every: int = 7, article_paragraphs: int = 12, seed: int = 0):
+        self.results = results
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.repeat_last_page = repeat_last_page
+        self.show_total = show_total
+        self.press_only_every = press_only_every
+        self.article_paragraphs = article_paragraphs
+        self.seed = seed
+
+
+def _article_id(query: str, n: int) -> str:
+    # Distinct per query so keyword runs do not share articles
+    prefix = int(hashlib.md5(query.encode("utf-8")).hexdigest()[:4], 16)
+    return f"{prefix:05d}{n:05d}"
+
+
+def search_page(config: StubConfig, query: str, start: int) -> str:
+    """Render the result page beginning at 1-based result `start`."""
+    if start > config.results and config.repeat_last_page and config.results:
+        start = (config.results - 1) // PAGE_SIZE * PAGE_SIZE + 1
+    cards = []
+    for n in range(start, min(start + PAGE_SIZE, config.results + 1)):
+        office = f"{n % 8 + 1:03d}"
+        aid = _article_id(query, n)
+        press_only = config.press_only_every and n % config.press_only_every == 0
+        card = _load("search_card_press.html" if press_only else "search_card.html")
+        cards.append(card.safe_substitute(
+            office=office, aid=aid, page=n % 30 + 1, query=query,
+            source=_SOURCES[n % len(_SOURCES)],
+            date=f"2024.{(n // 28) % 12 + 1:02d}.{n % 28 + 1:02d}.",
+            title=f"{urllib.parse.unquote(query)} 관련 기사 {n}",
+            summary=_SENTENCE[:80],
+            article_url=ARTICLE_URL.format(office=office, aid=aid),
+        ))
+    last = start + len(cards) - 1
+    return _load("search_page.html").safe_substitute(
+        query=query, cards="\n".join(cards), first=start, last=last,
+        total=f"{config.results:,}" if config.show_total else "",
+    )
+
+
+def article_page(config: StubConfig, office: str, aid: str) -> str:
+    """Render the article page for `office`/`aid`."""
+    body = "\n".join(f"    <p>{_SENTENCE * 3}({aid}-{i})</p>" for i in range(config.article_paragraphs))
+    return _load("article.html").safe_substitute(
+        title=f"기사 {aid}", source=_SOURCES[int(aid) % len(_SOURCES)],
+        date="2024-01-01 09:00:00", office=office, body=body,
+    )
+
+
+class StubServer:
+    """Threaded stub server; counts the responses it sends."""
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self.counts: Dict[str, int] = {"search": 0, "article": 0, "403": 0, "404": 0}
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def _draw(self):
+        with self._lock:
+            return self._rng.random(), self._rng.random()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately; avoid delayed-ACK stalls
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                # Proxied requests carry the absolute URL; direct ones only the path
+                parts = urllib.parse.urlsplit(self.path)
+                config = stub.config
+                error_draw, jitter_draw = stub._draw()
+                delay = config.latency + config.jitter * jitter_draw
+                if delay > 0:
+                    time.sleep(delay)
+                if error_draw < config.error_rate:
+                    stub._count("403")
+                    return self._send(403, "<html><body>Forbidden</body></html>")
+                segments = parts.path.strip("/").split("/")
+                if parts.path.endswith("/search.naver"):
+                    query = urllib.parse.parse_qs(parts.query)
+                    start = int(query.get("start", ["1"])[0])
+                    raw_query = urllib.parse.quote(query.get("query", [""])[0])
+                    stub._count("search")
+                    return self._send(200, search_page(config, raw_query, start))
+                if len(segments) >= 4 and segments[-3] == "article":
+                    stub._count("article")
+                    return self._send(200, article_page(config, segments[-2], segments[-1]))
+                stub._count("404")
+                return self._send(404, "<html><body>Not Found</body></html>")
+
+            def _send(self, status: int, html: str):
+                body = html.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="naver-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Naver 검색/기사 페이지 로컬 스텁 서버")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--results", type=int, default=200, help="검색어당 전체 결과 수. 기본 200")
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연(초). 기본 0")
+    parser.add_argument("--jitter", type=float, default=0.0, help="추가 무작위 지연 상한(초). 기본 0")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="403 응답 비율(0~1). 기본 0")
+    parser.add_argument("--empty-past-end", action="store_true",
+                        help="마지막 페이지 이후 요청에 빈 페이지 반환 (기본: 마지막 페이지 반복)")
+    parser.add_argument("--press-only-every", type=int, default=7,
+                        help="N번째 결과마다 네이버뉴스 링크 없이 언론사 링크만 있는 카드. 0이면 없음. 기본 7")
+    args = parser.parse_args()
+
+    config = StubConfig(results=args.results, latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, repeat_last_page=not args.empty_past_end,
+                        press_only_every=args.press_only_every)
+    server = StubServer(config, args.host, args.port).start()
+    print(f"Stub listening on {server.url} (use it as the HTTP proxy for {SEARCH_URL})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
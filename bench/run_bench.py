@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Offline crawler benchmark
+
+Starts the local stub (naver_stub.py), routes the crawler's session through
+it and measures:
+- end-to-end `crawler()` throughput (articles/s) and requests served
+- parse time per page for the selected backend's news_rows and for
+  parse_result_page, and per article for extract_article_content /
+  parse_article_content
+- peak memory (process max RSS; Python heap peak with --tracemalloc)
+
+Results are written as one JSON file per run, including the configuration,
+so runs across parser, concurrency and cache changes can be compared
+(--baseline prints the ratios against an earlier result file).
+
+Example:
+    python bench/run_bench.py --results 300 --latency 0.02 --workers 8 --label w8
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.parse
+from typing import Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import main  # noqa: E402
+from crawl_metrics import METRICS  # noqa: E402
+from html_parsers import BACKENDS, get_backend  # noqa: E402
+from http_cache import ResponseCache  # noqa: E402
+from rate_limit import AdaptiveRateLimiter  # noqa: E402
+from row_writer import read_csv_rows  # noqa: E402
+
+import naver_stub  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+S_DATE, E_DATE = "2024.01.01", "2024.03.31"
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _per_call_ms(fn, args_list, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for args in args_list:
+            fn(*args)
+    return round((time.perf_counter() - t0) / (repeat * len(args_list)) * 1000, 3)
+
+
+def setup_crawler(stub: naver_stub.StubServer, args, result_path: str) -> None:
+    """Point main.py's globals at the stub and the benchmark settings."""
+    main.RESULT_PATH = result_path
+    main.SEARCH_URL = naver_stub.SEARCH_URL
+    main.RATE_LIMITER = AdaptiveRateLimiter(args.host_rate, max_rate=max(args.host_rate, 1000.0),
+                                            base_backoff=0.05, max_backoff=1.0, breaker_cooldown=1.0)
+    main.MAX_RETRIES = args.max_retries
+    main.DEDUP_ARTICLES = False
+    main.PARSER = get_backend(args.parser)
+    main.RESPONSE_CACHE = None
+    if args.cache:
+        main.RESPONSE_CACHE = ResponseCache(os.path.join(result_path, ".http_cache"), max_bytes=1 << 30,
+                                            ttls={"search": None, "article": None})
+    session = main.configure_session(pool_size=args.workers)
+    session.trust_env = False
+    session.proxies = {"http": stub.url}
+
+
+def bench_crawl(args, keywords) -> dict:
+    """Run crawler() for every keyword and measure throughput."""
+    if args.tracemalloc:
+        tracemalloc.start()
+    paths = []
+    t0 = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for keyword in keywords:
+            paths.append(main.crawler(args.maxpage, urllib.parse.quote(keyword), "1", S_DATE, E_DATE,
+                                      workers=args.workers))
+    seconds = time.perf_counter() - t0
+    heap_peak = None
+    if args.tracemalloc:
+        heap_peak = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        tracemalloc.stop()
+    articles = sum(1 for path in paths for row in read_csv_rows(path) if row["contents"])
+    rows = sum(1 for path in paths for _ in read_csv_rows(path))
+    return {
+        "rows": rows,
+        "articles": articles,
+        "seconds": round(seconds, 3),
+        "articles_per_s": round(articles / seconds, 2) if seconds else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "tracemalloc_peak_mb": heap_peak,
+    }
+
+
+def bench_parse(config: naver_stub.StubConfig, repeat: int) -> dict:
+    """Time the parsing helpers on stub pages (article fetches go through the stub)."""
+    query = urllib.parse.quote("벤치마크")
+    page = naver_stub.search_page(config, query, 1)
+    article_urls = [row["link"] for row in main.PARSER.news_rows(page)]
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        article_html = main.fetch_and_save(article_urls[0]) if article_urls else ""
+        return {
+            "backend": main.PARSER.name,
+            "news_rows_ms_per_page": _per_call_ms(main.PARSER.news_rows, [(page,)], repeat),
+            # as the crawler calls it (memoized rows are reused with --cache)
+            "parse_result_page_ms_per_page": _per_call_ms(main.parse_result_page, [(page,)], repeat),
+            "parse_article_content_ms": _per_call_ms(main.parse_article_content, [(article_html,)], repeat),
+            "extract_article_content_ms": _per_call_ms(
+                main.extract_article_content, [(u,) for u in article_urls], 1),
+        }
+
+
+def compare(result: dict, baseline_path: str) -> None:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline_path} ({baseline.get('label')}, {baseline.get('git_commit')}):")
+    for section in ("crawl", "parse"):
+        for key, value in result[section].items():
+            old = baseline.get(section, {}).get(key)
+            if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+                print(f"  {section}.{key}: {old} -> {value} ({value / old:.2f}x)")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="로컬 스텁 서버 기반 오프라인 크롤러 벤치마크")
+    parser.add_argument("--keywords", type=int, default=2, help="크롤링할 키워드 수. 기본 2")
+    parser.add_argument("--results", type=int, default=200, help="키워드당 검색 결과 수. 기본 200")
+    parser.add_argument("--maxpage", type=int, default=50, help="키워드당 최대 페이지 수. 기본 50")
+    parser.add_argument("--latency", type=float, default=0.02, help="스텁 응답 지연(초). 기본 0.02")
+    parser.add_argument("--jitter", type=float, default=0.0, help="스텁 추가 무작위 지연 상한(초). 기본 0")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="403 응답 비율(0~1). 기본 0")
+    parser.add_argument("--empty-past-end", action="store_true",
+                        help="마지막 페이지 이후 빈 페이지 반환 (기본: 마지막 페이지 반복)")
+    parser.add_argument("--press-only-every", type=int, default=7,
+                        help="N번째 결과마다 언론사 링크만 있는 카드(네이버뉴스 링크 없음). 0이면 없음. 기본 7")
+    parser.add_argument("--workers", type=int, default=main.DEFAULT_WORKERS,
+                        help=f"기사 본문 동시 수집 워커 수. 기본 {main.DEFAULT_WORKERS}")
+    parser.add_argument("--host-rate", type=float, default=0.0,
+                        help="호스트별 초기 초당 요청 수. 0이면 제한 없음(기본)")
+    parser.add_argument("--max-retries", type=int, default=main.MAX_RETRIES, help="재시도 횟수")
+    parser.add_argument("--parser", choices=BACKENDS, default="auto", help="HTML 파서 백엔드. 기본 auto")
+    parser.add_argument("--cache", action="store_true", help="응답 캐시 사용 (임시 디렉터리)")
+    parser.add_argument("--parse-repeat", type=int, default=20, help="파싱 측정 반복 횟수. 기본 20")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Python 힙 최대 사용량도 측정 (측정 중 처리 속도가 느려짐)")
+    parser.add_argument("--label", type=str, default=None, help="결과에 붙일 이름")
+    parser.add_argument("--output", type=str, default=None,
+                        help="결과 JSON 경로 (기본: bench/results/<label 또는 시각>.json)")
+    parser.add_argument("--baseline", type=str, default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    config = naver_stub.StubConfig(results=args.results, latency=args.latency, jitter=args.jitter,
+                                   error_rate=args.error_rate, repeat_last_page=not args.empty_past_end,
+                                   press_only_every=args.press_only_every)
+    stub = naver_stub.StubServer(config).start()
+    started = datetime.datetime.now()
+    keywords = [f"벤치{i}" for i in range(args.keywords)]
+    try:
+        with tempfile.TemporaryDirectory(prefix="naver_bench_") as result_path:
+            setup_crawler(stub, args, result_path)
+            crawl = bench_crawl(args, keywords)
+            crawl["stub_responses"] = dict(stub.counts)
+            metrics = METRICS.snapshot()
+            parse = bench_parse(config, args.parse_repeat)
+    finally:
+        stub.stop()
+
+    result = {
+        "label": args.label,
+        "timestamp": started.isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "label")},
+        "crawl": crawl,
+        "parse": parse,
+        "metrics": metrics,
+    }
+    output = args.output or os.path.join(
+        BENCH_DIR, "results", f"{args.label or started.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    print(f"crawl: {crawl['articles']} articles in {crawl['seconds']} s "
+          f"({crawl['articles_per_s']} articles/s), peak RSS {crawl['peak_rss_mb']} MB")
+    print(f"parse ({parse['backend']}): {parse['news_rows_ms_per_page']} ms/page (news_rows), "
+          f"{parse['extract_article_content_ms']} ms/article (extract_article_content)")
+    print(f"Results saved to: {output}")
+    if args.baseline:
+        compare(result, args.baseline)
+
+
+if __name__ == "__main__":
+    main_cli()
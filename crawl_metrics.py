@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Crawl metrics: counters and per-stage latency histograms
+
+- Counters: requests, responses by status, retries, 403s, bytes, rows, ...
+- Histograms (seconds) per stage: network, parse, parse_article, extract,
+  cleanse, write
+- Output: periodic one-line JSON log, end-of-run report and an optional
+  Prometheus text-format dump file
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Upper bounds (seconds) of the histogram buckets; the last bucket is +Inf
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return BUCKETS[i] if i < len(BUCKETS) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+        }
+
+
+class CrawlMetrics:
+    """Thread-safe registry of counters and stage histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.counters: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._reporter: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def inc(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            hist = self.histograms.get(stage)
+            if hist is None:
+                hist = self.histograms[stage] = Histogram()
+            hist.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - t0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "elapsed": round(time.time() - self.started, 3),
+                "counters": dict(sorted(self.counters.items())),
+                "stages": {k: h.snapshot() for k, h in sorted(self.histograms.items())},
+            }
+
+    def json_line(self) -> str:
+        return json.dumps({"metrics": self.snapshot()}, ensure_ascii=False)
+
+    def prometheus_text(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = f"naver_crawler_{name}"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value:g}")
+            if self.histograms:
+                metric = "naver_crawler_stage_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                for stage, hist in sorted(self.histograms.items()):
+                    cumulative = 0
+                    for bound, count in zip(list(BUCKETS) + ["+Inf"], hist.counts):
+                        cumulative += count
+                        le = bound if isinstance(bound, str) else f"{bound:g}"
+                        lines.append(f'{metric}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+                    lines.append(f'{metric}_sum{{stage="{stage}"}} {hist.sum:.6f}')
+                    lines.append(f'{metric}_count{{stage="{stage}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+
+    def report(self) -> str:
+        """Human-readable end-of-run report."""
+        snap = self.snapshot()
+        lines = [f"Metrics after {snap['elapsed']:.1f} s"]
+        for name, value in snap["counters"].items():
+            lines.append(f"  {name}: {value:g}")
+        for stage, h in snap["stages"].items():
+            lines.append(f"  {stage}: n={h['count']} total={h['sum']:.2f}s mean={h['mean'] * 1000:.1f}ms "
+                         f"p50<={h['p50'] * 1000:g}ms p95<={h['p95'] * 1000:g}ms")
+        return "\n".join(lines)
+
+    def start_reporter(self, interval: float, prometheus_path: Optional[str] = None) -> None:
+        """Print a JSON metrics line (and refresh the Prometheus file) every `interval` seconds."""
+        if interval <= 0 or self._reporter is not None:
+            return
+
+        def _run():
+            while not self._stop.wait(interval):
+                print(self.json_line(), flush=True)
+                if prometheus_path:
+                    self.write_prometheus(prometheus_path)
+
+        self._reporter = threading.Thread(target=_run, name="metrics-reporter", daemon=True)
+        self._reporter.start()
+
+    def stop_reporter(self) -> None:
+        self._stop.set()
+        if self._reporter is not None:
+            self._reporter.join()
+            self._reporter = None
+
+
+METRICS = CrawlMetrics()
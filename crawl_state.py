@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Crawl state persisted next to the crawler output
+
+- SeenArticleIndex: article link -> extracted body (SQLite, kept on disk),
+  shared by all keywords and worker processes of a period so an article
+  matched by several keywords is fetched once
+- CrawlCheckpoint: per (keyword, period) page progress for --resume
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+
+class SeenArticleIndex:
+    """Link index backed by a SQLite file.
+
+    Bodies stay on disk and are read back on reuse, so memory does not grow
+    with the crawl. Several worker processes (--queue) may share one index.
+    Each body records the parser version that extracted it; bodies of another
+    version are not reused and get replaced when the article is fetched again.
+
+    Args:
+        path (str): SQLite file holding (link, contents, parser_version) rows.
+        parser_version (str): Version of the extraction logic (html_parsers.PARSER_VERSION).
+    """
+
+    def __init__(self, path: str, parser_version: str):
+        self.path = path
+        self.parser_version = parser_version
+        self._lock = threading.Lock()
+        self.reused = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS articles (link TEXT PRIMARY KEY, contents TEXT)")
+        # rows of the first layout have no version and are never reused
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(articles)")}
+        if "parser_version" not in columns:
+            self._db.execute("ALTER TABLE articles ADD COLUMN parser_version TEXT")
+        self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM articles WHERE parser_version = ?",
+                                    (self.parser_version,)).fetchone()[0]
+
+    def __contains__(self, link: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM articles WHERE link = ? AND parser_version = ?",
+                                    (link, self.parser_version)).fetchone() is not None
+
+    def get(self, link: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT contents FROM articles WHERE link = ? AND parser_version = ?",
+                                   (link, self.parser_version)).fetchone()
+            if row is None:
+                return None
+            self.reused += 1
+            return row[0]
+
+    def add(self, link: str, contents: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO articles (link, contents, parser_version) VALUES (?, ?, ?)"
+                " ON CONFLICT(link) DO UPDATE SET contents = excluded.contents,"
+                " parser_version = excluded.parser_version"
+                " WHERE articles.parser_version IS NOT excluded.parser_version",
+                (link, contents, self.parser_version))
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class CrawlCheckpoint:
+    """Progress of one (keyword, period) crawl, saved after every result page.
+
+    The state file records the next page_start, the number of rows written,
+    the byte size of each output file at that point and whether the crawl
+    finished. On resume the outputs are truncated back to those sizes, which
+    drops rows of a page that was interrupted before its state was saved.
+    """
+
+    def __init__(self, root: str, query: str, s_date: str, e_date: str):
+        os.makedirs(root, exist_ok=True)
+        self.query, self.s_date, self.e_date = query, s_date, e_date
+        name = f"{s_date.replace('.', '')}_{e_date.replace('.', '')}_{query}"
+        self.state_path = os.path.join(root, name + ".json")
+        self.page_start = 1
+        self.row_count = 0
+        self.offsets: Dict[str, int] = {}
+        self.complete = False
+
+    def reset(self) -> None:
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        self.page_start, self.row_count, self.offsets, self.complete = 1, 0, {}, False
+
+    def load(self) -> bool:
+        """Load saved progress. Returns False if there is none."""
+        if not os.path.exists(self.state_path):
+            return False
+        with open(self.state_path, encoding="utf-8") as f:
+            state = json.load(f)
+        self.page_start = state["page_start"]
+        self.row_count = state["row_count"]
+        self.offsets = state["offsets"]
+        self.complete = state["complete"]
+        return True
+
+    def save_page(self, next_page_start: int, row_count: int, offsets: Dict[str, int]) -> None:
+        """Record a finished page whose rows are already flushed to the outputs."""
+        self.page_start = next_page_start
+        self.row_count = row_count
+        self.offsets = dict(offsets)
+        self._write_state()
+
+    def mark_complete(self) -> None:
+        self.complete = True
+        self._write_state()
+
+    def _write_state(self) -> None:
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"page_start": self.page_start, "row_count": self.row_count,
+                       "offsets": self.offsets, "complete": self.complete}, f)
+        os.replace(tmp, self.state_path)
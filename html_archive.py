@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Compressed archive of raw HTML responses for offline replay
+
+- Segments: `<stamp>-<pid>-<n>.warc.gz`, WARC-like "resource" records, each
+  one its own gzip member (the usual .warc.gz layout, so standard WARC tools
+  can read them); every writer process appends to its own segments and starts
+  a new one past `segment_bytes`
+- Sidecar index per segment (`<stamp>-<pid>-<n>.idx`): one
+  "offset<TAB>length<TAB>normalized URL" line per record, written after the
+  record itself, so a crash can only lose the unindexed tail
+- Reader: loads every index once and serves records from memory-mapped
+  segments; a URL archived more than once resolves to its newest record
+- Used by main.py: `--archive DIR` appends what the crawler fetches and
+  `--replay DIR` re-runs the crawl (search page parsing, item extraction,
+  article bodies) from the archive without any network request
+"""
+
+import glob
+import gzip
+import mmap
+import os
+import threading
+import time
+import uuid
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from http_cache import normalize_url
+
+SEGMENT_SUFFIX = ".warc.gz"
+INDEX_SUFFIX = ".idx"
+DEFAULT_SEGMENT_MB = 1024
+COMPRESS_LEVEL = 6
+
+
+def _record(url: str, body: bytes, fetched_at: float) -> bytes:
+    header = (
+        "WARC/1.0\r\n"
+        "WARC-Type: resource\r\n"
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+        f"WARC-Date: {time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(fetched_at))}\r\n"
+        f"WARC-Target-URI: {url}\r\n"
+        "Content-Type: text/html; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "\r\n"
+    )
+    return header.encode("utf-8") + body + b"\r\n\r\n"
+
+
+def _read_record(data: bytes) -> str:
+    """Body of one decompressed record."""
+    head, _, rest = data.partition(b"\r\n\r\n")
+    for line in head.split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            return rest[:int(value)].decode("utf-8")
+    return rest[:-4].decode("utf-8")
+
+
+def _index_paths(root: str) -> List[str]:
+    # names start with a timestamp, so this is also the order they were written in
+    return sorted(glob.glob(os.path.join(root, "*" + INDEX_SUFFIX)))
+
+
+def _read_index(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t", 2)
+            if len(parts) == 3:
+                yield int(parts[0]), int(parts[1]), parts[2]
+
+
+class HtmlArchive:
+    """Append-only writer of raw HTML responses.
+
+    Args:
+        root (str): Archive directory (shared by all writers).
+        segment_bytes (int): Start a new segment once the current one is this large.
+    """
+
+    def __init__(self, root: str, segment_bytes: int = DEFAULT_SEGMENT_MB * 1024 * 1024):
+        self.root = root
+        self.segment_bytes = segment_bytes
+        self.records = 0
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        # URLs already archived (by any writer), so cached pages are stored once
+        self._archived = {url for path in _index_paths(root) for _, _, url in _read_index(path)}
+        self._prefix = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self._seq = -1
+        self._data = None
+        self._index = None
+
+    def _open_segment(self) -> None:
+        self.close()
+        self._seq += 1
+        base = os.path.join(self.root, f"{self._prefix}-{self._seq:03d}")
+        self._data = open(base + SEGMENT_SUFFIX, "ab")
+        self._index = open(base + INDEX_SUFFIX, "a", encoding="utf-8")
+
+    def __contains__(self, url: str) -> bool:
+        return normalize_url(url) in self._archived
+
+    def append(self, url: str, html: str, replace: bool = True) -> bool:
+        """Archive one response body.
+
+        Args:
+            replace (bool): Also store it if the URL is archived already (a
+                fresh download); False skips known URLs (a cached body).
+
+        Returns:
+            bool: True if a record was written.
+        """
+        key = normalize_url(url)
+        if not replace and key in self._archived:
+            return False
+        member = gzip.compress(_record(url, html.encode("utf-8"), time.time()), compresslevel=COMPRESS_LEVEL)
+        with self._lock:
+            if self._data is None or self._data.tell() >= self.segment_bytes:
+                self._open_segment()
+            offset = self._data.tell()
+            self._data.write(member)
+            self._data.flush()
+            self._index.write(f"{offset}\t{len(member)}\t{key}\n")
+            self._index.flush()
+            self._archived.add(key)
+            self.records += 1
+            self.bytes_written += len(member)
+        return True
+
+    def summary(self) -> str:
+        return f"{self.records} records appended ({self.bytes_written / 1e6:.1f} MB compressed) to {self.root}"
+
+    def close(self) -> None:
+        for f in (self._data, self._index):
+            if f is not None:
+                f.close()
+        self._data = self._index = None
+
+
+class ArchiveReader:
+    """Random access to archived responses by URL through memory-mapped segments.
+
+    Args:
+        root (str): Archive directory written by HtmlArchive.
+    """
+
+    def __init__(self, root: str):
+        if not os.path.isdir(root):
+            raise FileNotFoundError(f"archive directory not found: {root}")
+        self.root = root
+        self._segments: List[mmap.mmap] = []
+        self._files = []
+        self._index: Dict[str, Tuple[int, int, int]] = {}
+        self.compressed_bytes = 0
+        for index_path in _index_paths(root):
+            segment_path = index_path[:-len(INDEX_SUFFIX)] + SEGMENT_SUFFIX
+            if not os.path.exists(segment_path) or os.path.getsize(segment_path) == 0:
+                continue
+            f = open(segment_path, "rb")
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            segment = len(self._segments)
+            self._files.append(f)
+            self._segments.append(mm)
+            self.compressed_bytes += len(mm)
+            for offset, length, url in _read_index(index_path):
+                if offset + length <= len(mm):  # skip records cut off by a crash
+                    self._index[url] = (segment, offset, length)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, url: str) -> bool:
+        return normalize_url(url) in self._index
+
+    def get(self, url: str) -> Optional[str]:
+        """Newest archived body of `url`, or None if it was never archived."""
+        location = self._index.get(normalize_url(url))
+        if location is None:
+            return None
+        segment, offset, length = location
+        return _read_record(zlib.decompress(self._segments[segment][offset:offset + length], wbits=31))
+
+    def summary(self) -> str:
+        return (f"{len(self._index)} URLs in {len(self._segments)} segments "
+                f"({self.compressed_bytes / 1e6:.1f} MB compressed) at {self.root}")
+
+    def close(self) -> None:
+        for mm in self._segments:
+            mm.close()
+        for f in self._files:
+            f.close()
+        self._segments, self._files = [], []
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+Pluggable HTML parser backends for search-result and article pages
+
+- selectolax (lexbor): fastest, used when installed
+- lxml: C-backed tree + XPath, used when selectolax is missing
+- BeautifulSoup (html.parser): always-available fallback
+
+Every backend uses the same selector strategy: find only the anchors that
+point at news.naver.com, then read title/source/date from the enclosing
+news card, instead of scanning every <a> on the page. Backends record the
+time spent per page in `stats`.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional dependency
+    LexborHTMLParser = None
+
+try:
+    import lxml.html as lxml_html
+except ImportError:  # optional dependency
+    lxml_html = None
+
+NAVER_NEWS_LINK = re.compile(r"^https?://(?:n\.)?news\.naver\.com/")
+
+# Search-page selectors (news card layout)
+NEWS_ANCHOR = 'a[href*="news.naver.com"]'
+HEADLINE = 'span.sds-comps-text-type-headline1'
+SOURCE = 'span.sds-comps-profile-info-title-text a'
+DATE = 'span.sds-comps-profile-info-subtext .sds-comps-text'
+# Article-page selector
+ARTICLE_BODY = 'div.newsct_article._article_body'
+
+BACKENDS = ("auto", "selectolax", "lxml", "bs4")
+
+# Bump when extraction logic changes so memoized parse results are not reused
+PARSER_VERSION = "2-" + hashlib.sha1(
+    "|".join((NEWS_ANCHOR, HEADLINE, SOURCE, DATE, ARTICLE_BODY)).encode("utf-8")).hexdigest()[:8]
+
+# Total hit count shown on the result page, e.g. "1-10 / 1,234건"
+_TOTAL_RESULTS = re.compile(r"/\s*([\d,]+)\s*건")
+_PAGE_RANGE = re.compile(r"([\d,]+)\s*-\s*([\d,]+)\s*/\s*([\d,]+)\s*건")
+# One headline per result card, whether or not the card links to Naver News
+_CARD_HEADLINE = re.compile(r"\bsds-comps-text-type-headline1\b")
+
+
+def _int(text: str) -> int:
+    return int(text.replace(",", ""))
+
+
+def parse_total_results(html: str) -> Optional[int]:
+    """Return the total result count reported on a search page, if shown."""
+    m = _TOTAL_RESULTS.search(html)
+    return _int(m.group(1)) if m else None
+
+
+def parse_page_range(html: str) -> Optional[Tuple[int, int, int]]:
+    """Return (first, last, total) from the "first-last / total건" counter, if shown."""
+    m = _PAGE_RANGE.search(html)
+    return (_int(m.group(1)), _int(m.group(2)), _int(m.group(3))) if m else None
+
+
+def count_result_cards(html: str) -> int:
+    """Number of result cards on a search page, including cards that only link to the publisher."""
+    return len(_CARD_HEADLINE.findall(html))
+
+
+class ParseStats:
+    """Accumulated parse time per page type."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.page_seconds = 0.0
+        self.articles = 0
+        self.article_seconds = 0.0
+
+    def record_page(self, seconds: float) -> None:
+        with self._lock:
+            self.pages += 1
+            self.page_seconds += seconds
+
+    def record_article(self, seconds: float) -> None:
+        with self._lock:
+            self.articles += 1
+            self.article_seconds += seconds
+
+    def summary(self) -> str:
+        page_ms = self.page_seconds / self.pages * 1000 if self.pages else 0.0
+        article_ms = self.article_seconds / self.articles * 1000 if self.articles else 0.0
+        return (f"{self.pages} result pages ({page_ms:.1f} ms/page), "
+                f"{self.articles} articles ({article_ms:.1f} ms/article)")
+
+
+def _row(title: str, link: str, source: str, date: str) -> dict:
+    return {'title': title, 'link': link, 'source': source, 'date': date, 'contents': ''}
+
+
+def _date_index(count: int) -> Optional[int]:
+    # the second subtext is the date; the first one is used when it is alone
+    if count > 1:
+        return 1
+    return 0 if count else None
+
+
+class SoupBackend:
+    """BeautifulSoup backend (fallback)."""
+
+    name = "bs4"
+
+    def __init__(self, features: str = "html.parser"):
+        self.features = features
+        self.stats = ParseStats()
+
+    def _card(self, anchor):
+        for parent in anchor.parents:
+            if parent.select_one(HEADLINE):
+                return parent
+        return anchor.parent or anchor
+
+    def _news_rows(self, html: str) -> List[dict]:
+        soup = BeautifulSoup(html, self.features)
+        rows, seen = [], set()
+        for a in soup.select(NEWS_ANCHOR):
+            href = a.get("href", "").split("?", 1)[0]
+            title = a.get_text(strip=True)
+            if not NAVER_NEWS_LINK.match(href) or not title or href in seen:
+                continue
+            seen.add(href)
+            card = self._card(a)
+            t = card.select_one(HEADLINE)
+            s = card.select_one(SOURCE)
+            d_list = card.select(DATE)
+            i = _date_index(len(d_list))
+            rows.append(_row(
+                (t.get_text(strip=True) if t else '') or title,
+                href,
+                s.get_text(strip=True) if s else '',
+                d_list[i].get_text(strip=True) if i is not None else '',
+            ))
+        return rows
+
+    def _article_body(self, html: str) -> str:
+        node = BeautifulSoup(html, self.features).select_one(ARTICLE_BODY)
+        return node.get_text(separator=" ", strip=True) if node else ""
+
+    def news_rows(self, html: str) -> List[dict]:
+        """Return row dicts (title, link, source, date, empty contents) for a result page."""
+        t0 = time.perf_counter()
+        rows = self._news_rows(html)
+        self.stats.record_page(time.perf_counter() - t0)
+        return rows
+
+    def article_body(self, html: str) -> str:
+        """Return the article body text, or "" if the body element is missing."""
+        t0 = time.perf_counter()
+        text = self._article_body(html)
+        self.stats.record_article(time.perf_counter() - t0)
+        return text
+
+
+class SelectolaxBackend(SoupBackend):
+    """selectolax (lexbor) backend."""
+
+    name = "selectolax"
+
+    def _card(self, anchor):
+        node = anchor.parent
+        while node is not None:
+            if node.css_first(HEADLINE) is not None:
+                return node
+            node = node.parent
+        return anchor.parent or anchor
+
+    def _news_rows(self, html: str) -> List[dict]:
+        tree = LexborHTMLParser(html)
+        rows, seen = [], set()
+        for a in tree.css(NEWS_ANCHOR):
+            href = (a.attributes.get("href") or "").split("?", 1)[0]
+            title = a.text(strip=True)
+            if not NAVER_NEWS_LINK.match(href) or not title or href in seen:
+                continue
+            seen.add(href)
+            card = self._card(a)
+            t = card.css_first(HEADLINE)
+            s = card.css_first(SOURCE)
+            d_list = card.css(DATE)
+            i = _date_index(len(d_list))
+            rows.append(_row(
+                (t.text(strip=True) if t else '') or title,
+                href,
+                s.text(strip=True) if s else '',
+                d_list[i].text(strip=True) if i is not None else '',
+            ))
+        return rows
+
+    @staticmethod
+    def _text(node, separator: str = "") -> str:
+        # node.text(separator=...) keeps the separator around whitespace-only nodes
+        return separator.join(s.strip() for s in (n.text_content for n in node.traverse(include_text=True)
+                                                   if n.tag == "-text") if s.strip())
+
+    def _article_body(self, html: str) -> str:
+        node = LexborHTMLParser(html).css_first(ARTICLE_BODY)
+        return self._text(node, " ") if node else ""
+
+
+def _has_class(cls: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+class LxmlBackend(SoupBackend):
+    """lxml backend using XPath equivalents of the CSS selectors."""
+
+    name = "lxml"
+
+    _ANCHORS = "//a[contains(@href, 'news.naver.com')]"
+    _CARD = f"ancestor::*[.//span[{_has_class('sds-comps-text-type-headline1')}]][1]"
+    _HEADLINE = f".//span[{_has_class('sds-comps-text-type-headline1')}]"
+    _SOURCE = f".//span[{_has_class('sds-comps-profile-info-title-text')}]//a"
+    _DATE = (f".//span[{_has_class('sds-comps-profile-info-subtext')}]"
+             f"//*[{_has_class('sds-comps-text')}]")
+    _BODY = (f"//div[{_has_class('newsct_article')} and {_has_class('_article_body')}]")
+
+    @staticmethod
+    def _text(node, separator: str = "") -> str:
+        return separator.join(s.strip() for s in node.itertext() if s.strip())
+
+    def _news_rows(self, html: str) -> List[dict]:
+        if not html.strip():
+            return []
+        tree = lxml_html.fromstring(html)
+        rows, seen = [], set()
+        for a in tree.xpath(self._ANCHORS):
+            href = (a.get("href") or "").split("?", 1)[0]
+            title = self._text(a)
+            if not NAVER_NEWS_LINK.match(href) or not title or href in seen:
+                continue
+            seen.add(href)
+            cards = a.xpath(self._CARD)
+            card = cards[0] if cards else (a.getparent() if a.getparent() is not None else a)
+            t = card.xpath(self._HEADLINE)
+            s = card.xpath(self._SOURCE)
+            d_list = card.xpath(self._DATE)
+            i = _date_index(len(d_list))
+            rows.append(_row(
+                (self._text(t[0]) if t else '') or title,
+                href,
+                self._text(s[0]) if s else '',
+                self._text(d_list[i]) if i is not None else '',
+            ))
+        return rows
+
+    def _article_body(self, html: str) -> str:
+        if not html.strip():
+            return ""
+        nodes = lxml_html.fromstring(html).xpath(self._BODY)
+        return self._text(nodes[0], " ") if nodes else ""
+
+
+def get_backend(name: str = "auto") -> SoupBackend:
+    """Return a parser backend by name; 'auto' picks the fastest one installed."""
+    if name == "auto":
+        name = "selectolax" if LexborHTMLParser is not None else ("lxml" if lxml_html is not None else "bs4")
+    if name == "selectolax":
+        if LexborHTMLParser is None:
+            raise SystemExit("selectolax 백엔드를 사용하려면 selectolax가 필요합니다: pip install selectolax")
+        return SelectolaxBackend()
+    if name == "lxml":
+        if lxml_html is None:
+            raise SystemExit("lxml 백엔드를 사용하려면 lxml이 필요합니다: pip install lxml")
+        return LxmlBackend()
+    if name == "bs4":
+        return SoupBackend()
+    raise ValueError(f"Unknown parser backend: {name}")
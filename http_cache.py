@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk HTTP response cache for the Naver news crawler
+
+- Key: sha256 of the normalized URL (content-addressed file layout)
+- Body: gzip-compressed HTML, one file per URL
+- Index: SQLite table with namespace, size, fetch time and last access
+- Per-namespace TTL (search pages expire, article pages do not) and
+  LRU eviction once the total size exceeds the configured budget
+- Validators (ETag, Last-Modified, body hash) kept per URL so expired
+  entries can be revalidated with conditional requests
+- Parsed results memoized by body hash, so an unchanged page is not parsed
+  again; they count against the size budget and are evicted with their body
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from typing import Any, Dict, NamedTuple, Optional
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so equivalent spellings share one cache entry.
+
+    Lower-cases scheme and host, drops the fragment and sorts query parameters.
+    """
+    parts = urllib.parse.urlsplit(url.strip())
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+    return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+def url_key(url: str) -> str:
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+def content_hash(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class CacheEntry(NamedTuple):
+    body: str
+    fresh: bool
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: Optional[str]
+
+
+class ResponseCache:
+    """Size-bounded, TTL-aware cache of response bodies keyed by URL.
+
+    Args:
+        root (str): Cache directory.
+        max_bytes (int): Disk budget for compressed bodies; least recently used
+            entries are evicted beyond it.
+        ttls (dict): Seconds each namespace stays fresh. None means forever.
+    """
+
+    def __init__(self, root: str, max_bytes: int, ttls: Optional[Dict[str, Optional[float]]] = None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttls = ttls or {}
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, list] = {}  # key -> [lock, number of holders and waiters]
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, namespace TEXT, url TEXT, size INTEGER,"
+            " fetched_at REAL, accessed_at REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at)")
+        # validator columns were added after the first cache layout
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(entries)")}
+        for column in ("etag", "last_modified", "content_hash"):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE entries ADD COLUMN {column} TEXT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_hash ON entries(content_hash)")
+        # parsed results are evicted with the response body they were parsed from
+        parsed_columns = {row[1] for row in self._db.execute("PRAGMA table_info(parsed)")}
+        if parsed_columns and "body_hash" not in parsed_columns:
+            self._db.execute("DROP TABLE parsed")  # memo of the first layout, outside the size budget
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS parsed (key TEXT PRIMARY KEY, value TEXT, body_hash TEXT, size INTEGER)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS parsed_body ON parsed(body_hash)")
+        self._db.commit()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self.parse_hits = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".html.gz")
+
+    @contextmanager
+    def inflight(self, url: str):
+        """Serialize concurrent fetches of the same URL so only one hits the network."""
+        key = url_key(url)
+        with self._lock:
+            slot = self._inflight.get(key)
+            if slot is None:
+                slot = self._inflight[key] = [threading.Lock(), 0]
+            slot[1] += 1
+        try:
+            with slot[0]:
+                yield
+        finally:
+            with self._lock:
+                slot[1] -= 1
+                if slot[1] == 0:
+                    del self._inflight[key]
+
+    def lookup(self, url: str, namespace: str) -> Optional[CacheEntry]:
+        """Return the stored entry (fresh or expired) for a URL, or None.
+
+        Counts a hit (fresh), a revalidation (expired: the caller sends a
+        conditional request) or a miss (not stored).
+        """
+        key = url_key(url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fetched_at, etag, last_modified, content_hash FROM entries WHERE key = ?",
+                (key,)).fetchone()
+        body = None
+        if row is not None:
+            try:
+                with gzip.open(self._path(key), "rt", encoding="utf-8") as f:
+                    body = f.read()
+            except (OSError, EOFError):
+                pass
+        if body is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        ttl = self.ttls.get(namespace)
+        fresh = ttl is None or time.time() - row[0] <= ttl
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.revalidations += 1
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        return CacheEntry(body, fresh, row[1], row[2], row[3])
+
+    def revalidated(self, url: str, not_modified: bool, unchanged: bool = False) -> None:
+        """Record the outcome of a conditional request; a 304 renews the entry's TTL."""
+        with self._lock:
+            if not_modified:
+                self.not_modified += 1
+                self._db.execute("UPDATE entries SET fetched_at = ? WHERE key = ?", (time.time(), url_key(url)))
+                self._db.commit()
+            elif unchanged:
+                self.unchanged += 1
+
+    def get_parsed(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM parsed WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.parse_hits += 1
+        return json.loads(row[0])
+
+    def put_parsed(self, key: str, value: Any, body_hash: str) -> None:
+        """Memoize a parse result of the body with content hash `body_hash`.
+
+        The result counts against the size budget and is evicted together
+        with the last cached response that has this body.
+        """
+        text = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO parsed VALUES (?, ?, ?, ?)",
+                             (key, text, body_hash, len(text.encode("utf-8"))))
+            self._db.commit()
+        self._evict()
+
+    def put(self, url: str, namespace: str, body: str,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        key = url_key(url)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(tmp, path)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries"
+                " (key, namespace, url, size, fetched_at, accessed_at, etag, last_modified, content_hash)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, namespace, normalize_url(url), os.path.getsize(path), now, now,
+                 etag, last_modified, content_hash(body)),
+            )
+            self._db.commit()
+        self._evict()
+
+    def _total_size(self) -> int:
+        return self._db.execute(
+            "SELECT (SELECT COALESCE(SUM(size), 0) FROM entries)"
+            " + (SELECT COALESCE(SUM(size), 0) FROM parsed)").fetchone()[0]
+
+    def _drop_parsed(self, body_hash: Optional[str]) -> int:
+        """Delete the parse results of a body no cached response has any more; returns their size."""
+        if body_hash is None or self._db.execute(
+                "SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (body_hash,)).fetchone():
+            return 0
+        size = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM parsed WHERE body_hash = ?", (body_hash,)).fetchone()[0]
+        self._db.execute("DELETE FROM parsed WHERE body_hash = ?", (body_hash,))
+        return size
+
+    def _evict(self) -> None:
+        """Evict least recently used responses, with their parse results, down to the budget."""
+        with self._lock:
+            if self._total_size() <= self.max_bytes:
+                return
+            # results of bodies that were replaced by a newer response go first
+            self._db.execute("DELETE FROM parsed WHERE NOT EXISTS"
+                             " (SELECT 1 FROM entries e WHERE e.content_hash = parsed.body_hash)")
+            total = self._total_size()
+            for key, size, body_hash in self._db.execute(
+                    "SELECT key, size, content_hash FROM entries ORDER BY accessed_at").fetchall():
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size + self._drop_parsed(body_hash)
+            self._db.commit()
+
+    def summary(self) -> str:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            total = self._total_size()
+        return (f"hits: {self.hits}, misses: {self.misses}, entries: {count}, size: {total / 1e6:.1f} MB, "
+                f"revalidated: {self.revalidations} ({self.not_modified} not modified, "
+                f"{self.unchanged} unchanged), parse memo hits: {self.parse_hits}")
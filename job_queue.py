@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+Durable crawl job queue shared by any number of worker processes
+
+- SQLite file; workers on several machines can share it over a filesystem
+  with working POSIX locks (rollback journal, no WAL, so no shared memory)
+- Jobs: one keyword x period, optionally split into date slices that are
+  crawled independently and a final "combine" job per keyword x period that
+  becomes leasable once all of its slices are done
+- Leases: a worker owns a job until its lease expires; long crawls renew it
+  and stop writing once a renewal fails. Jobs of workers that died are picked
+  up again after the lease runs out
+- Retries: failed jobs go back to pending with exponential backoff until
+  `max_attempts` is reached, then they stay failed (see `retry_failed`)
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+DEFAULT_LEASE = 600.0  # seconds
+DEFAULT_MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 30.0  # first retry delay (s); doubles per attempt
+MAX_RETRY_BACKOFF = 1800.0
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Job(NamedTuple):
+    id: int
+    kind: str  # "crawl" or "combine"
+    keyword: str
+    s_date: str
+    e_date: str
+    slice_start: str
+    slice_end: str
+    seq: int
+    attempts: int
+
+
+_COLUMNS = "id, kind, keyword, s_date, e_date, slice_start, slice_end, seq, attempts"
+
+
+class JobQueue:
+    """SQLite-backed queue of (keyword, period, date slice) crawl jobs.
+
+    Args:
+        path (str): Queue database file.
+        lease (float): Seconds a leased job stays owned without renewal.
+        max_attempts (int): Attempts before a job is marked failed.
+    """
+
+    def __init__(self, path: str, lease: float = DEFAULT_LEASE, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # isolation_level=None: transactions are managed explicitly (BEGIN IMMEDIATE)
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT, keyword TEXT, s_date TEXT, e_date TEXT,"
+            " slice_start TEXT, slice_end TEXT, seq INTEGER, status TEXT DEFAULT 'pending',"
+            " attempts INTEGER DEFAULT 0, not_before REAL DEFAULT 0, owner TEXT, lease_expires REAL,"
+            " last_error TEXT, result TEXT, updated_at REAL,"
+            " UNIQUE (kind, keyword, s_date, e_date, slice_start, slice_end))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, not_before)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_group ON jobs(keyword, s_date, e_date)")
+
+    def _write(self, fn):
+        """Run `fn(db)` in an immediate (write-locked) transaction."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._db)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return result
+
+    def enqueue(self, keyword: str, s_date: str, e_date: str,
+                slices: Optional[List[Tuple[str, str]]] = None) -> int:
+        """Add the jobs of one keyword x period; already queued jobs are left alone.
+
+        Args:
+            slices: Date sub-ranges crawled as separate jobs and combined
+                afterwards. None (or a single range) crawls the whole period
+                as one job.
+
+        Returns:
+            int: Number of jobs added.
+        """
+        now = time.time()
+        if slices and len(slices) > 1:
+            rows = [("crawl", keyword, s_date, e_date, a, b, i) for i, (a, b) in enumerate(slices)]
+            rows.append(("combine", keyword, s_date, e_date, s_date, e_date, len(slices)))
+        else:
+            rows = [("crawl", keyword, s_date, e_date, s_date, e_date, 0)]
+
+        def _insert(db):
+            before = db.total_changes
+            db.executemany(
+                "INSERT OR IGNORE INTO jobs (kind, keyword, s_date, e_date, slice_start, slice_end, seq,"
+                " updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [row + (now,) for row in rows])
+            return db.total_changes - before
+
+        return self._write(_insert)
+
+    def lease(self, owner: str) -> Optional[Job]:
+        """Take the oldest runnable job (pending, or leased with an expired lease).
+
+        Combine jobs only become runnable once every slice of their group is done.
+        A job whose lease expired on its last attempt (its worker keeps dying)
+        is marked failed instead of being leased again.
+        """
+        now = time.time()
+
+        def _take(db):
+            lost = db.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts)).fetchall()
+            for job in map(Job._make, lost):
+                db.execute(
+                    "UPDATE jobs SET status = 'failed', last_error = ?, lease_expires = NULL, updated_at = ?"
+                    " WHERE id = ?", (f"lease expired on attempt {job.attempts} (worker lost)", now, job.id))
+                self._fail_combine(db, job, now)
+            row = db.execute(
+                f"SELECT {_COLUMNS} FROM jobs j WHERE"
+                " ((status = 'pending' AND not_before <= ?) OR (status = 'leased' AND lease_expires < ?))"
+                " AND (kind = 'crawl' OR NOT EXISTS (SELECT 1 FROM jobs p WHERE p.kind = 'crawl'"
+                "  AND p.keyword = j.keyword AND p.s_date = j.s_date AND p.e_date = j.e_date"
+                "  AND p.status != 'done'))"
+                " ORDER BY id LIMIT 1", (now, now)).fetchone()
+            if row is None:
+                return None
+            job = Job(*row)
+            db.execute(
+                "UPDATE jobs SET status = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1,"
+                " updated_at = ? WHERE id = ?", (owner, now + self.lease_seconds, now, job.id))
+            return job._replace(attempts=job.attempts + 1)
+
+        return self._write(_take)
+
+    def renew(self, job: Job, owner: str) -> bool:
+        """Extend the lease of a job still owned by `owner`."""
+        now = time.time()
+
+        def _renew(db):
+            cur = db.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND owner = ?"
+                " AND status = 'leased'", (now + self.lease_seconds, now, job.id, owner))
+            return cur.rowcount == 1
+
+        return self._write(_renew)
+
+    def complete(self, job: Job, owner: str, result: str = "") -> None:
+        self._write(lambda db: db.execute(
+            "UPDATE jobs SET status = 'done', result = ?, lease_expires = NULL, updated_at = ?"
+            " WHERE id = ? AND owner = ?", (result, time.time(), job.id, owner)))
+
+    def fail(self, job: Job, owner: str, error: str) -> str:
+        """Record a failed attempt; returns the job's new status ('pending' or 'failed')."""
+        now = time.time()
+        status = "failed" if job.attempts >= self.max_attempts else "pending"
+        delay = min(MAX_RETRY_BACKOFF, RETRY_BACKOFF * (2 ** max(0, job.attempts - 1)))
+
+        def _fail(db):
+            db.execute(
+                "UPDATE jobs SET status = ?, last_error = ?, not_before = ?, lease_expires = NULL,"
+                " updated_at = ? WHERE id = ? AND owner = ?", (status, error[-2000:], now + delay, now, job.id, owner))
+            if status == "failed":
+                self._fail_combine(db, job, now)
+
+        self._write(_fail)
+        return status
+
+    @staticmethod
+    def _fail_combine(db, job: Job, now: float) -> None:
+        """A failed slice means its group's combine job can never run; fail it too so workers can exit."""
+        if job.kind != "crawl":
+            return
+        db.execute(
+            "UPDATE jobs SET status = 'failed', last_error = ?, updated_at = ? WHERE kind = 'combine'"
+            " AND keyword = ? AND s_date = ? AND e_date = ? AND status = 'pending'",
+            (f"slice {job.slice_start}~{job.slice_end} failed", now, job.keyword, job.s_date, job.e_date))
+
+    def retry_failed(self) -> int:
+        """Put failed jobs back in the queue with a fresh attempt budget."""
+        return self._write(lambda db: db.execute(
+            "UPDATE jobs SET status = 'pending', attempts = 0, not_before = 0, updated_at = ?"
+            " WHERE status = 'failed'", (time.time(),)).rowcount)
+
+    def slice_results(self, job: Job) -> List[str]:
+        """Outputs of the crawl slices in a combine job's group, in slice order."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT result FROM jobs WHERE kind = 'crawl' AND keyword = ? AND s_date = ? AND e_date = ?"
+                " ORDER BY seq", (job.keyword, job.s_date, job.e_date)).fetchall()
+        return [r[0] for r in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status ('leased' only counts unexpired leases)."""
+        now = time.time()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT CASE WHEN status = 'leased' AND lease_expires < ? THEN 'pending' ELSE status END,"
+                " COUNT(*) FROM jobs GROUP BY 1", (now,)).fetchall()
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows))
+        return counts
+
+    def summary(self) -> str:
+        return ", ".join(f"{k} {v}" for k, v in self.counts().items())
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class LeaseLost(RuntimeError):
+    """The worker no longer owns the job it is running; its output must not be written."""
+
+
+class LeaseKeeper:
+    """Renew a job's lease in the background while it is being worked on.
+
+    The job body calls `check()` before writing output: once a renewal fails
+    (another worker took the job over) or the lease ran out without one (the
+    process was stalled), it raises LeaseLost so the body stops.
+    """
+
+    def __init__(self, queue: JobQueue, job: Job, owner: str):
+        self.job = job
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._expires = time.time() + queue.lease_seconds
+
+        def _run():
+            while not self._stop.wait(queue.lease_seconds / 3):
+                renewed_at = time.time()
+                if not queue.renew(job, owner):
+                    self.lost.set()
+                    break
+                self._expires = renewed_at + queue.lease_seconds
+
+        self._thread = threading.Thread(target=_run, name=f"lease-{job.id}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def check(self) -> None:
+        """Raise LeaseLost if the job may already belong to another worker."""
+        if self.lost.is_set() or time.time() >= self._expires:
+            self.lost.set()
+            raise LeaseLost(f"job {self.job.id}: lease lost, another worker may own it now")
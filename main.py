@@ -3,49 +3,90 @@
 네이버 뉴스 검색시 리스트 크롤링하는 프로그램 (_select 사용)
 - 크롤링 해오는 것 : 링크, 제목, 신문사, 날짜, 본문
 - 날짜, 본문 -> 정제 작업 필요
-- 리스트 -> 딕셔너리 -> df -> CSV로 저장
+- 리스트 -> 딕셔너리 -> 페이지 단위로 CSV(선택: JSON Lines)에 스트리밍 저장
 """
 # -*- coding: utf-8 -*-
-from bs4 import BeautifulSoup
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 import re
 import os
 import urllib.parse
 import time
-import random
 import argparse
-from typing import List, Tuple
+import asyncio
+import contextlib
+import datetime
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from article_store import ArticleStore
+from crawl_metrics import METRICS
+from crawl_state import CrawlCheckpoint, SeenArticleIndex
+from html_archive import ArchiveReader, HtmlArchive
+from html_parsers import (BACKENDS, PARSER_VERSION, count_result_cards, get_backend, parse_page_range,
+                          parse_total_results)
+from http_cache import ResponseCache, content_hash
+from job_queue import DEFAULT_LEASE, DEFAULT_MAX_ATTEMPTS, Job, JobQueue, LeaseKeeper, LeaseLost, worker_name
+from parse_pool import ParsePool
+from rate_limit import AdaptiveRateLimiter
+from result_catalog import ResultCatalog, parse_result_name
+from row_writer import OUTPUT_FORMATS, RowWriter, read_csv_rows, require_pyarrow
+from text_cleanse import cleanse_rows
 
 # Output path setup (can be overridden via CLI)
 RESULT_PATH = "out/"
 os.makedirs(RESULT_PATH, exist_ok=True)
 
+# Streaming output settings (can be overridden via CLI)
+WRITE_JSONL = False
+WRITE_BATCH_SIZE = 100
+OUTPUT_FORMAT = "csv"
+CLEAN_ROWS = False  # clean each page's rows before writing (text_cleanse.py)
+ARTICLE_STORE: Optional[ArticleStore] = None  # also write rows to a SQLite store (--store)
+
+# Concurrency defaults (can be overridden via CLI)
+DEFAULT_WORKERS = 4
+DEFAULT_HOST_RATE = 5.0  # initial requests per second per host
+DEFAULT_MAX_HOST_RATE = 20.0
+DEFAULT_SHARD_PARALLEL = 4
+SHARD_MODES = ("none", "week", "day", "auto")
+DEFAULT_METRICS_INTERVAL = 60.0  # seconds between JSON metrics log lines
+
+
+# Helper: cleansing functions (single values; whole pages are cleaned by text_cleanse.cleanse_rows)
+_DATE_TEXT = re.compile(r"\d+\.(\d+)\.(\d+)\.")
+_DATE_FALLBACK = re.compile(r"\w* (\d\w*)")
+_CONTENTS_HEADER = re.compile(r"<dl>.*?</a> </div> </dd> <dd>")
+_RELATION_LIST = re.compile(r'<ul class="relation_lst">.*?</dd>')
+_TAG = re.compile(r"<.+?>")
+
 
-# Helper: cleansing functions
 def date_cleansing(text):
-    try:
-        pattern = r"\d+\.(\d+)\.(\d+)\."
-        r = re.compile(pattern)
-        match = r.search(text).group(0)
-        return match
-    except Exception:
-        pattern = r"\w* (\d\w*)"
-        r = re.compile(pattern)
-        m = r.search(text)
-        return m.group(1) if m else text
+    m = _DATE_TEXT.search(text)
+    if m:
+        return m.group(0)
+    m = _DATE_FALLBACK.search(text)
+    return m.group(1) if m else text
 
 
 def contents_cleansing(contents_html):
-    first = re.sub(r"<dl>.*?</a> </div> </dd> <dd>", "", str(contents_html)).strip()
-    second = re.sub(r'<ul class="relation_lst">.*?</dd>', "", first).strip()
-    third = re.sub(r"<.+?>", "", second).strip()
+    first = _CONTENTS_HEADER.sub("", str(contents_html)).strip()
+    second = _RELATION_LIST.sub("", first).strip()
+    third = _TAG.sub("", second).strip()
     return third
 
 
+# Search endpoint (overridden by the offline benchmark to reach its stub server)
+SEARCH_URL = "https://search.naver.com/search.naver"
+
+
 def build_url(page_start: int, query: str, s_date: str, e_date: str, s_from: str, e_to: str) -> str:
     return (
-        "https://search.naver.com/search.naver?ssc=tab.news.all&query="
+        SEARCH_URL + "?ssc=tab.news.all&query="
         + query
         + "&sm=tab_opt&sort=1&photo=3&field=0&pd=3&ds="
         + s_date
@@ -61,62 +102,303 @@ def build_url(page_start: int, query: str, s_date: str, e_date: str, s_from: str
     )
 
 
-# Fetch a single page and save raw HTML
-def fetch_and_save(url: str) -> str:
-    # url = build_url(page_start, query, s_date, e_date, s_from, e_to)
-    print("GET", url)
-    time.sleep(0.2)
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-        'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'DNT': '1',
-        'Connection': 'keep-alive'
-    }
+# Adaptive per-host rate limiter shared by all fetches (see rate_limit.py)
+RATE_LIMITER = AdaptiveRateLimiter(DEFAULT_HOST_RATE)
+MAX_RETRIES = 4
+
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive'
+}
+
+
+class ConnectionStats:
+    """Counts requests and newly opened connections of the shared session,
+    and times each TCP/TLS connect so handshake savings can be reported.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.connect_seconds = 0.0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_connect(self, seconds: float) -> None:
+        with self._lock:
+            self.connections += 1
+            self.connect_seconds += seconds
+
+    def summary(self) -> str:
+        reused = max(0, self.requests - self.connections)
+        avg = self.connect_seconds / self.connections if self.connections else 0.0
+        return (
+            f"requests: {self.requests}, connections opened: {self.connections}, "
+            f"reused: {reused}, avg connect: {avg * 1000:.1f} ms, "
+            f"est. handshake time saved: {reused * avg:.1f} s"
+        )
+
+
+CONNECTION_STATS = ConnectionStats()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        t0 = time.perf_counter()
+        super().connect()
+        CONNECTION_STATS.record_connect(time.perf_counter() - t0)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        t0 = time.perf_counter()
+        super().connect()
+        CONNECTION_STATS.record_connect(time.perf_counter() - t0)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report connects to CONNECTION_STATS."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def configure_session(pool_size: int = DEFAULT_WORKERS, pool_hosts: int = 4) -> requests.Session:
+    """(Re)create the shared keep-alive session.
+
+    Args:
+        pool_size (int): Connections kept alive per host; should match the worker count.
+        pool_hosts (int): Number of per-host pools to keep (search, news, ...).
+
+    Returns:
+        requests.Session: The shared session used by fetch_and_save.
+    """
+    global _session
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = PooledAdapter(pool_connections=pool_hosts, pool_maxsize=max(1, pool_size))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    with _session_lock:
+        old, _session = _session, session
+    if old is not None:
+        old.close()
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the shared session, creating it with default pool size on first use."""
+    with _session_lock:
+        session = _session
+    return session if session is not None else configure_session()
+
+
+# Response cache (None disables caching; configured from CLI)
+RESPONSE_CACHE: Optional[ResponseCache] = None
+DEFAULT_CACHE_MB = 2048
+DEFAULT_SEARCH_TTL = 3600.0  # seconds; article pages never expire
+
+
+def cache_namespace(url: str) -> str:
+    """Return the cache namespace for a URL: 'search' or 'article'."""
+    return "search" if "search.naver.com" in urllib.parse.urlsplit(url).netloc else "article"
+
+
+def _retry_after(r: requests.Response) -> Optional[float]:
     try:
-        r = requests.get(url, headers=headers, timeout=10)
-        print("status", r.status_code)
-        if r.status_code == 403:
-            print("Received 403 Forbidden. Retrying after 5 seconds...")
-            time.sleep(5)
-            r = requests.get(url, headers=headers, timeout=10)
+        return float(r.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+def _download(url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[str, int, Dict[str, str]]:
+    """GET `url` on the shared session; returns (html, status, response headers).
+    Status 0 on error.
+
+    Throttle responses (403/429/5xx) and connection errors are retried up to
+    MAX_RETRIES times with jittered exponential backoff, and every response
+    adjusts the host's rate in RATE_LIMITER. An error response left after the
+    retries comes back as html 'NaN' with its status, so its body is never
+    parsed as a result page or an article.
+    """
+    session = get_session()
+    html, status, resp_headers = 'NaN', 0, {}
+    for attempt in range(MAX_RETRIES + 1):
+        RATE_LIMITER.acquire(url)
+        t0 = time.perf_counter()
+        retry_after = None
+        try:
+            CONNECTION_STATS.record_request()
+            METRICS.inc("requests_total")
+            r = session.get(url, headers=headers, timeout=10)
             print("status", r.status_code)
-        html = r.text
-    except Exception:
+            html, status, resp_headers = r.text, r.status_code, dict(r.headers)
+            retry_after = _retry_after(r)
+            METRICS.inc("bytes_received_total", len(r.content))
+            METRICS.inc(f"http_{status}_total")
+        except requests.RequestException as e:
+            print("request failed:", e)
+            html, status = 'NaN', 0
+            METRICS.inc("request_errors_total")
+        latency = time.perf_counter() - t0
+        METRICS.observe("network", latency)
+        throttled = RATE_LIMITER.record(url, status, latency)
+        if not throttled or attempt == MAX_RETRIES:
+            break
+        METRICS.inc("retries_total")
+        delay = RATE_LIMITER.backoff(attempt, retry_after)
+        print(f"Throttled ({status or 'error'}). Retry {attempt + 1}/{MAX_RETRIES} after {delay:.1f} s...")
+        time.sleep(delay)
+    if status not in (200, 304):
+        if status:
+            print(f"giving up on {url} (status {status})")
         html = 'NaN'
-    # print(r)
-    # Save raw for inspection
-    # raw_path = os.path.join(RESULT_PATH, f'{s_from}-{e_to}_{page_start}.html')
-    # with open(raw_path, 'w', encoding='utf-8') as f:
-    #     f.write(html)
+    return html, status, resp_headers
+
+
+# Cross-keyword article dedup (disabled via CLI --no-dedup)
+DEDUP_ARTICLES = True
+_seen_indexes: Dict[Tuple[str, str], SeenArticleIndex] = {}
+_seen_lock = threading.Lock()
+
+
+def get_seen_index(s_date: str, e_date: str) -> Optional[SeenArticleIndex]:
+    """Return the shared seen-article index for a period, loading it from disk once."""
+    if not DEDUP_ARTICLES:
+        return None
+    with _seen_lock:
+        index = _seen_indexes.get((s_date, e_date))
+        if index is None:
+            name = f"{s_date.replace('.', '')}_{e_date.replace('.', '')}.sqlite"
+            index = SeenArticleIndex(os.path.join(RESULT_PATH, ".seen", name), PARSER_VERSION)
+            _seen_indexes[(s_date, e_date)] = index
+        return index
+
+
+# HTML parser backend (fastest installed by default; see html_parsers.py).
+# Replaced by a ParsePool when parsing runs in worker processes (--parse-procs).
+PARSER = get_backend("auto")
+
+
+# Fetch a single page, served from the response cache when possible
+# Raw HTML archive: responses are appended to it (--archive), or the crawl is
+# replayed from it without network requests (--replay)
+HTML_ARCHIVE: Optional[HtmlArchive] = None
+REPLAY_ARCHIVE: Optional[ArchiveReader] = None
+
+
+def fetch_and_save(url: str) -> str:
+    # url = build_url(page_start, query, s_date, e_date, s_from, e_to)
+    if REPLAY_ARCHIVE is not None:
+        return replay_response(url)
+    html, status, downloaded = _fetch_response(url)
+    if HTML_ARCHIVE is not None and status == 200:
+        # fresh downloads are always stored; cached bodies only if not archived yet
+        if HTML_ARCHIVE.append(url, html, replace=downloaded):
+            METRICS.inc("archive_records_total")
     return html
 
-# Parse HTML and select news items using updated selectors
-import re
 
-NAVER_NEWS_LINK = re.compile(r"^https?://(?:n\.)?news\.naver\.com/")
-
-def parse_news_items(html: str):
-    soup = BeautifulSoup(html, "html.parser")
-    # Find all headline anchors that look like Naver news articles
-    headline_links = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"].split("?", 1)[0]
-        if NAVER_NEWS_LINK.match(href):
-            # Title text is usually in the anchor text
-            title_text = a.get_text(strip=True)
-            if title_text:
-                headline_links.append((a, href, title_text))
-    # De-duplicate by href to avoid repeated anchors in the same card
-    seen = set()
-    unique_items = []
-    for a, href, title in headline_links:
-        if href in seen:
-            continue
-        seen.add(href)
-        unique_items.append({"anchor": a, "href": href, "title": title})
-    return unique_items
+def replay_response(url: str) -> str:
+    """Serve `url` from REPLAY_ARCHIVE; an unarchived URL reads as a failed request ('NaN')."""
+    with METRICS.timer("archive_read"):
+        html = REPLAY_ARCHIVE.get(url)
+    if html is None:
+        print("MISS", url)
+        METRICS.inc("archive_misses_total")
+        return 'NaN'
+    METRICS.inc("archive_hits_total")
+    return html
+
+
+def _fetch_response(url: str) -> Tuple[str, int, bool]:
+    """Fetch `url` through RESPONSE_CACHE; returns (html, status, downloaded).
+
+    Cached bodies report status 200 and downloaded=False.
+    """
+    cache = RESPONSE_CACHE
+    if cache is None:
+        print("GET", url)
+        html, status, _ = _download(url)
+        return html, status, True
+
+    namespace = cache_namespace(url)
+    # Concurrent requests for the same URL wait here and then hit the cache
+    with cache.inflight(url):
+        entry = cache.lookup(url, namespace)
+        if entry is not None and entry.fresh:
+            print("CACHE", url)
+            METRICS.inc("cache_hits_total")
+            return entry.body, 200, False
+        # Expired entries are revalidated with a conditional request
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        print("GET", url, "(revalidate)" if entry is not None else "")
+        html, status, resp_headers = _download(url, headers)
+        if status == 304 and entry is not None:
+            cache.revalidated(url, not_modified=True)
+            METRICS.inc("cache_hits_total")
+            return entry.body, 200, False
+        if status == 200:
+            if entry is not None:
+                cache.revalidated(url, not_modified=False, unchanged=content_hash(html) == entry.content_hash)
+            cache.put(url, namespace, html, etag=resp_headers.get('ETag'),
+                      last_modified=resp_headers.get('Last-Modified'))
+    return html, status, True
+
+
+def parse_result_page(html: str) -> List[dict]:
+    """Parse a search result page, reusing the memoized rows of an identical page.
+
+    The memo key includes the backend and PARSER_VERSION, so changing the
+    extraction logic re-parses cached pages. The whole call is timed as stage
+    "extract", the parsing itself (memo misses) as "parse".
+    """
+    with METRICS.timer("extract"):
+        return _page_rows(html)
+
+
+def _page_rows(html: str) -> List[dict]:
+    cache = RESPONSE_CACHE
+    if cache is None or html == 'NaN':
+        with METRICS.timer("parse"):
+            return PARSER.news_rows(html)
+    body_hash = content_hash(html)
+    key = f"rows:{PARSER.name}:{PARSER_VERSION}:{body_hash}"
+    rows = cache.get_parsed(key)
+    if rows is None:
+        with METRICS.timer("parse"):
+            rows = PARSER.news_rows(html)
+        cache.put_parsed(key, rows, body_hash)
+    return rows
 
 
 def extract_article_content(news_url: str) -> str:
@@ -125,101 +407,404 @@ def extract_article_content(news_url: str) -> str:
     If the element is not found, return an empty string.
     """
     html = fetch_and_save(news_url)
+    return parse_article_content(html)
+
+
+def parse_article_content(html: str) -> str:
+    """Extract the article body text from an article page's HTML."""
+    with METRICS.timer("parse_article"):
+        return PARSER.article_body(html)
+
+
+def fetch_article_contents(urls: List[str], workers: int = DEFAULT_WORKERS,
+                           seen: Optional[SeenArticleIndex] = None) -> List[str]:
+    """Fetch article bodies for `urls` concurrently, preserving input order.
+
+    Empty urls map to an empty string without a request. Links already in
+    `seen` reuse the stored body instead of being fetched again. With a
+    ParsePool as PARSER, fetch threads hand the HTML to the pool and move on
+    to the next article while it is parsed.
+    """
+    def _fetch(u: str):
+        if not u:
+            return ''
+        if seen is not None:
+            known = seen.get(u)
+            if known is not None:
+                METRICS.inc("articles_reused_total")
+                return known
+        html = fetch_and_save(u)
+        if isinstance(PARSER, ParsePool):
+            return PARSER.submit_article_body(html)
+        return parse_article_content(html)
 
-    soup = BeautifulSoup(html, "html.parser")
-    node = soup.select_one("div.newsct_article._article_body")
-    if not node:
-        return ""
-
-    return node.get_text(separator=" ", strip=True)
-
-# Extract fields from a single item
-def extract_from_item(item):
-    title = link = source = date = content = ''
-
-    # extract title # 
-    t = item.select_one('span.sds-comps-text-type-headline1')
-    if t:
-        title = t.get_text(strip=True)
-        link = t.get('href', '')
-    
-    # extract source
-    s = item.select_one('span.sds-comps-profile-info-title-text a')
-    if s:
-        source = s.get_text(strip=True)
-
-    # extract date 
-    d_list = item.select('span.sds-comps-profile-info-subtext .sds-comps-text')
-    d = d_list[1] if len(d_list) > 1 else (d_list[0] if d_list else None)
-    if d:
-        date = d.get_text(strip=True)
-
-    # c = item.select_one('span.sds-comps-text-type-body1')
-    # if c:
-    #     content = c.get_text(strip=True)
-
-    # extract href from a tag
-    news_url = ''
-    u = item.select_one('a.DJwZySR1gWTQoLm3xvvD')
-    if u:
-        news_url = u.get('href', '').split('?', 1)[0]
-        content = extract_article_content(news_url)
-
-    # Given the news url, parse 
-
-    return {
-        'title': title,
-        'link': news_url,
-        'source': source,
-        'date': date,
-        'contents': content
-    }
-
-
-def crawler(maxpage, query, sort, s_date, e_date):
+    if workers <= 1 or len(urls) <= 1:
+        results = [_fetch(u) for u in urls]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_fetch, urls))
+    contents = [r.result() if isinstance(r, Future) else r for r in results]
+    if seen is not None:
+        for u, content in zip(urls, contents):
+            if u and content:
+                seen.add(u, content)
+    return contents
+
+
+def crawler(maxpage, query, sort, s_date, e_date, workers: int = DEFAULT_WORKERS,
+            resume: bool = False, shard: str = "none", shard_parallel: int = DEFAULT_SHARD_PARALLEL):
     """
     Crawls multiple pages of news articles and accumulates results.
 
+    Result pages are fetched and parsed one by one; the article bodies of
+    each page are fetched concurrently by up to `workers` threads.
+
     Args:
         maxpage (int or str): Number of pages to crawl (10 results per page).
         query (str): Search query.
         sort (str): Sort order (0: relevance, 1: latest, 2: oldest).
         s_date (str): Start date in "YYYY.MM.DD" format.
         e_date (str): End date in "YYYY.MM.DD" format.
+        workers (int): Number of concurrent article fetchers.
+        resume (bool): Continue from the last saved checkpoint instead of page 1.
+        shard (str): Split the period into sub-ranges crawled in parallel:
+            "none", "week", "day" or "auto" (bisect ranges that hit maxpage).
+        shard_parallel (int): Number of sub-ranges crawled at once.
 
     Returns:
-        str: Path to the saved CSV file.
+        str: Path to the saved output file.
     """
     # TODO: sort option implementation
-    data_rows = []
-    page_start = 1
-    maxpage_t = (int(maxpage) - 1) * 10 + 1
-    
+    if shard != "none":
+        return crawl_sharded(maxpage, query, s_date, e_date, workers, resume, shard, shard_parallel)
+    return crawl_range(maxpage, query, s_date, e_date, workers, resume)
+
+
+def crawl_range(maxpage, query, s_date, e_date, workers: int = DEFAULT_WORKERS, resume: bool = False,
+                output_path: Optional[str] = None, seen: Optional[SeenArticleIndex] = None,
+                lease: Optional[LeaseKeeper] = None) -> str:
+    """Crawl one query over one date range into `output_path` (default: the keyword's output file).
+
+    With the `lease` of a queue job, every page write first checks that the
+    job is still owned by this worker and raises LeaseLost otherwise.
+    """
+    if seen is None:
+        seen = get_seen_index(s_date, e_date)
+    checkpoint, writer = open_output(query, s_date, e_date, resume, output_path)
+    if writer is None:
+        return output_path or output_path_for(query, s_date)
+    pager = Pager(checkpoint.page_start, maxpage, writer.written_links() if writer.resumed else None)
+
     # Calculate s_from and e_to for this query
     s_from = s_date.replace(".", "")
     e_to = e_date.replace(".", "")
 
-    while page_start <= maxpage_t:
-        url = build_url(page_start, query, s_date, e_date, s_from, e_to)
+    while not pager.finished:
+        url = build_url(pager.page_start, query, s_date, e_date, s_from, e_to)
         html = fetch_and_save(url)
-        items = parse_news_items(html)
-        # print(items)
-        for it in items:
-            row = extract_from_item(it)
-            data_rows.append(row)
-        print('accumulated rows:', len(data_rows))
-        page_start += 10
-
-        # break if there are no more articles
-        if len(items) == 0:
-            break
-        
-        time.sleep(random.uniform(2, 5))
-    # Build DataFrame and export to CSV
-    df = pd.DataFrame(data_rows, columns=['date', 'title', 'source', 'contents', 'link'])
-    print(df.shape)
+        t0 = time.perf_counter()
+        rows = pager.accept(html, parse_result_page(html))
+        parse_ms = (time.perf_counter() - t0) * 1000
+        contents = fetch_article_contents([row['link'] for row in rows], workers, seen)
+        for row, content in zip(rows, contents):
+            row['contents'] = content
+        if lease is not None:
+            lease.check()
+        commit_page(checkpoint, writer, pager.page_start, rows)
+        print('accumulated rows:', writer.rows_written, f'(page parse {parse_ms:.1f} ms, {PARSER.name})')
+    pager.close(urllib.parse.unquote(query))
+    if lease is not None:
+        lease.check()
+    return finish_output(checkpoint, writer)
 
-    # Use "YYQnumber" format for output file name
+
+class PaginationStats:
+    """Run-wide count of result pages fetched and skipped by early termination."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.pages_saved = 0
+        self.repeated_rows = 0
+        self.reasons: Dict[str, int] = {}
+
+    def record(self, pages: int, pages_saved: int, repeated_rows: int, reason: str) -> None:
+        with self._lock:
+            self.pages += pages
+            self.pages_saved += pages_saved
+            self.repeated_rows += repeated_rows
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def summary(self) -> str:
+        reasons = ", ".join(f"{k}: {v}" for k, v in sorted(self.reasons.items()))
+        return (f"{self.pages} result pages fetched, {self.pages_saved} page requests saved, "
+                f"{self.repeated_rows} repeated rows skipped ({reasons})")
+
+
+PAGINATION_STATS = PaginationStats()
+
+
+def page_cards(html: str, page_range: Optional[Tuple[int, int, int]], rows: int) -> int:
+    """Number of result cards on a search page: from its "first-last" counter,
+    else its card headlines, else (unknown layout) the parsed rows."""
+    if page_range is not None:
+        return max(0, page_range[1] - page_range[0] + 1)
+    return count_result_cards(html) or rows
+
+
+class PageFetchError(RuntimeError):
+    """A result page could not be fetched (error status after retries, or missing from the replay archive)."""
+
+
+class Pager:
+    """Walks the start= offsets of one query and stops as soon as paging is useless.
+
+    A page that failed to download raises PageFetchError instead of ending
+    the crawl, so its checkpoint stays incomplete and --resume retries it.
+    Otherwise paging stops when a page has no result cards, shows no link not already
+    seen in this crawl (Naver repeats its last page for larger offsets), has
+    fewer than 10 result cards, or when the page counter ("1-10 / 1,234건")
+    reaches the total. Cards are counted on the page itself, since cards that
+    only link to the publisher's site yield no row. Rows whose link was
+    already seen are dropped.
+
+    Args:
+        links: Links already written by an interrupted crawl being resumed.
+    """
+
+    PAGE_SIZE = 10
+
+    def __init__(self, page_start: int, maxpage, links: Optional[Iterable[str]] = None):
+        self.page_start = page_start
+        self.maxpage_t = (int(maxpage) - 1) * self.PAGE_SIZE + 1
+        self.links = set(links or ())
+        self.total: Optional[int] = None
+        self.pages = 0
+        self.repeated_rows = 0
+        self.stop_reason: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.stop_reason is not None or self.page_start > self.maxpage_t
+
+    def accept(self, html: str, rows: List[dict]) -> List[dict]:
+        """Record a fetched page, advance the offset and return its new rows."""
+        if html == 'NaN':
+            raise PageFetchError(f"result page start={self.page_start} failed to download")
+        self.pages += 1
+        self.page_start += self.PAGE_SIZE
+        page_range = parse_page_range(html)
+        if self.total is None:
+            self.total = page_range[2] if page_range else parse_total_results(html)
+        cards = page_cards(html, page_range, len(rows))
+        new_rows = [row for row in rows if not row['link'] or row['link'] not in self.links]
+        self.links.update(row['link'] for row in new_rows if row['link'])
+        self.repeated_rows += len(rows) - len(new_rows)
+        if cards == 0:
+            self.stop_reason = "empty page"
+        elif rows and not new_rows:
+            self.stop_reason = "no new links"
+        elif cards < self.PAGE_SIZE:
+            self.stop_reason = "last page"
+        elif page_range is not None and page_range[1] >= page_range[2]:
+            self.stop_reason = "total reached"
+        elif self.total is not None and len(self.links) >= self.total:
+            self.stop_reason = "total reached"
+        return new_rows
+
+    def close(self, label: str = "") -> None:
+        reason = self.stop_reason or "maxpage"
+        saved = 0
+        if self.stop_reason is not None and self.page_start <= self.maxpage_t:
+            saved = (self.maxpage_t - self.page_start) // self.PAGE_SIZE + 1
+        PAGINATION_STATS.record(self.pages, saved, self.repeated_rows, reason)
+        print(f"[{label}] paging stopped: {reason} ({self.pages} pages, {saved} page requests saved)")
+
+
+def open_output(query: str, s_date: str, e_date: str, resume: bool,
+                output_path: Optional[str] = None) -> Tuple[CrawlCheckpoint, Optional[RowWriter]]:
+    """Open the checkpoint and streaming writer of a (query, period) crawl.
+
+    With `resume`, outputs are truncated back to the last completed page and
+    appended to; otherwise any previous progress is discarded. The writer is
+    None when the checkpoint says the crawl already finished.
+    """
+    checkpoint = CrawlCheckpoint(os.path.join(RESULT_PATH, ".checkpoints"), query, s_date, e_date)
+    output_path = output_path or output_path_for(query, s_date)
+    label = urllib.parse.unquote(query)
+    # parquet output only exists once finished; until then rows are staged as .jsonl
+    staged = os.path.splitext(output_path)[0] + ".jsonl"
+    if resume and checkpoint.load() and (os.path.exists(output_path) or os.path.exists(staged)):
+        if checkpoint.complete:
+            print(f"[{label}] already complete ({checkpoint.row_count} rows), skipping")
+            return checkpoint, None
+        print(f"[{label}] resuming at start={checkpoint.page_start} with {checkpoint.row_count} rows")
+        writer = RowWriter(output_path, jsonl=WRITE_JSONL, batch_size=WRITE_BATCH_SIZE,
+                           offsets=checkpoint.offsets, rows_written=checkpoint.row_count)
+        return checkpoint, writer
+    checkpoint.reset()
+    return checkpoint, RowWriter(output_path, jsonl=WRITE_JSONL, batch_size=WRITE_BATCH_SIZE)
+
+
+# Output catalogs (see result_catalog.py), one per result directory
+_catalogs: Dict[str, ResultCatalog] = {}
+_catalog_lock = threading.Lock()
+
+
+def catalog_output(writer: RowWriter, complete: bool = False) -> None:
+    """Record a keyword output's rows, size and date range in its directory's catalog."""
+    if parse_result_name(os.path.basename(writer.path)) is None:
+        return  # shard parts and other intermediate files are not cataloged
+    root = os.path.dirname(os.path.abspath(writer.path))
+    with _catalog_lock:
+        catalog = _catalogs.get(root)
+        if catalog is None:
+            catalog = _catalogs[root] = ResultCatalog(root)
+    # parquet output only exists once closed; count the staged bytes until then
+    size = os.path.getsize(writer.path) if complete else sum(writer.offsets().values())
+    catalog.record(writer.path, writer.rows_written, size, writer.date_min, writer.date_max,
+                   complete=complete, extend_range=writer.resumed)
+
+
+def commit_page(checkpoint: CrawlCheckpoint, writer: RowWriter, next_page_start: int, rows: List[dict]) -> None:
+    """Write a finished page's rows and record it in the checkpoint and the catalog."""
+    if CLEAN_ROWS:
+        rows = cleanse_rows(rows)
+    with METRICS.timer("write"):
+        writer.write_rows(rows)
+        writer.flush()
+        if ARTICLE_STORE is not None:
+            # before the checkpoint: a page re-crawled after a crash is stored again (idempotent)
+            ARTICLE_STORE.add_rows(rows, urllib.parse.unquote(checkpoint.query), quarter_label(checkpoint.s_date))
+        checkpoint.save_page(next_page_start, writer.rows_written, writer.offsets())
+        catalog_output(writer)
+    METRICS.inc("rows_written_total", len(rows))
+
+
+def finish_output(checkpoint: CrawlCheckpoint, writer: RowWriter) -> str:
+    writer.close()
+    checkpoint.mark_complete()
+    catalog_output(writer, complete=True)
+    print(f"rows written: {writer.rows_written}")
+    return writer.path
+
+
+def _parse_day(d: str) -> datetime.date:
+    return datetime.datetime.strptime(d, "%Y.%m.%d").date()
+
+
+def _format_day(d: datetime.date) -> str:
+    return d.strftime("%Y.%m.%d")
+
+
+def split_period(s_date: str, e_date: str, days: int) -> List[Tuple[str, str]]:
+    """Split [s_date, e_date] into consecutive ranges of at most `days` days."""
+    start, end = _parse_day(s_date), _parse_day(e_date)
+    slices = []
+    while start <= end:
+        stop = min(end, start + datetime.timedelta(days=days - 1))
+        slices.append((_format_day(start), _format_day(stop)))
+        start = stop + datetime.timedelta(days=1)
+    return slices
+
+
+def _probe_page(query: str, s_date: str, e_date: str, page_start: int) -> Tuple[str, List[str]]:
+    url = build_url(page_start, query, s_date, e_date, s_date.replace(".", ""), e_date.replace(".", ""))
+    html = fetch_and_save(url)
+    return html, [row['link'] for row in parse_result_page(html)]
+
+
+def slice_saturated(query: str, s_date: str, e_date: str, maxpage: int) -> bool:
+    """True if a range has results beyond `maxpage` pages.
+
+    Uses the total of the first page's counter ("1-10 / 1,234건") when it is
+    shown. Otherwise probes the last allowed page: it counts if it is full of
+    result cards and differs from the page before it, since Naver repeats the
+    final page for out-of-range offsets. Cards are counted on the page, not
+    from the Naver News rows, which skip cards linking only to the publisher.
+    """
+    capacity = int(maxpage) * Pager.PAGE_SIZE
+    html, links = _probe_page(query, s_date, e_date, 1)
+    page_range = parse_page_range(html)
+    if page_range is not None:
+        return page_range[2] > capacity
+    last = capacity - Pager.PAGE_SIZE + 1
+    if last > 1:
+        html, links = _probe_page(query, s_date, e_date, last)
+    if page_cards(html, None, len(links)) < Pager.PAGE_SIZE:
+        return False
+    if last == 1:
+        return True
+    return links != _probe_page(query, s_date, e_date, last - Pager.PAGE_SIZE)[1]
+
+
+def plan_shards(query: str, s_date: str, e_date: str, maxpage: int, mode: str) -> List[Tuple[str, str]]:
+    """Return the sub-ranges to crawl, newest first."""
+    if mode == "week":
+        slices = split_period(s_date, e_date, 7)
+    elif mode == "day":
+        slices = split_period(s_date, e_date, 1)
+    else:
+        # auto: bisect every range whose results do not fit in maxpage pages
+        slices, pending = [], [(s_date, e_date)]
+        while pending:
+            a, b = pending.pop()
+            start, end = _parse_day(a), _parse_day(b)
+            if start == end or not slice_saturated(query, a, b, maxpage):
+                slices.append((a, b))
+                continue
+            mid = start + (end - start) // 2
+            pending.append((a, _format_day(mid)))
+            pending.append((_format_day(mid + datetime.timedelta(days=1)), b))
+    return sorted(slices, reverse=True)
+
+
+def crawl_sharded(maxpage, query, s_date, e_date, workers: int, resume: bool,
+                  mode: str, parallel: int) -> str:
+    """Crawl sub-ranges of the period in parallel and combine them into the keyword's output."""
+    label = urllib.parse.unquote(query)
+    slices = plan_shards(query, s_date, e_date, maxpage, mode)
+    print(f"[{label}] {len(slices)} shards ({mode}): " + ", ".join(f"{a}~{b}" for a, b in slices))
+    output_path = output_path_for(query, s_date)
+    seen = get_seen_index(s_date, e_date)
+
+    def _crawl(slice_range: Tuple[str, str]) -> str:
+        a, b = slice_range
+        part = shard_part_path(query, s_date, a, b)
+        return crawl_range(maxpage, query, a, b, workers, resume, output_path=part, seen=seen)
+
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as pool:
+        parts = list(pool.map(_crawl, slices))
+    return combine_parts(parts, output_path)
+
+
+def shard_part_path(query: str, s_date: str, a: str, b: str) -> str:
+    """Return the part file of sub-range a~b of a keyword's period (created on demand)."""
+    output_path = output_path_for(query, s_date)
+    part_dir = os.path.join(RESULT_PATH, ".shards", os.path.splitext(os.path.basename(output_path))[0])
+    os.makedirs(part_dir, exist_ok=True)
+    return os.path.join(part_dir, f"{a.replace('.', '')}_{b.replace('.', '')}.csv")
+
+
+def combine_parts(parts: List[str], output_path: str) -> str:
+    """Stream shard outputs into one file, dropping links repeated across shards."""
+    writer = RowWriter(output_path, jsonl=WRITE_JSONL, batch_size=WRITE_BATCH_SIZE)
+    links = set()
+    for part in parts:
+        for row in read_csv_rows(part):
+            link = row.get('link', '')
+            if link and link in links:
+                continue
+            links.add(link)
+            writer.write_rows([row])
+    writer.close()
+    catalog_output(writer, complete=True)
+    print(f"combined {len(parts)} shards: {writer.rows_written} rows")
+    return output_path
+
+
+def quarter_label(s_date: str) -> str:
+    """Return the "YYQnumber" label (e.g. "24Q1") of the quarter `s_date` falls in."""
     # Extract year and month from s_date to determine quarter
     year_short = s_date[2:4]
     month = int(s_date[5:7])
@@ -231,15 +816,188 @@ def crawler(maxpage, query, sort, s_date, e_date):
         quarter = 3
     else:
         quarter = 4
+    return f"{year_short}Q{quarter}"
+
+
+def output_path_for(query: str, s_date: str) -> str:
+    """Return the output file path for a query crawled from `s_date`."""
+    # Use "YYQnumber" format for output file name
     # Use decoded query (keyword) for filename readability
     try:
         decoded_query = urllib.parse.unquote(query)
     except Exception:
         decoded_query = query
-    outputFileName = f"{year_short}Q{quarter}_{decoded_query}.csv"
-    output_path = os.path.join(RESULT_PATH, outputFileName)
-    df.to_csv(output_path, index=False, encoding='utf-8-sig')
-    return output_path
+    outputFileName = f"{quarter_label(s_date)}_{decoded_query}.{OUTPUT_FORMAT}"
+    return os.path.join(RESULT_PATH, outputFileName)
+
+
+QUEUE_SPLITS = ("none", "week", "day")
+DEFAULT_QUEUE_POLL = 10.0  # seconds between lease attempts while other workers finish
+
+
+def enqueue_jobs(queue: JobQueue, keywords: List[str], periods: List[Tuple[str, str]], split: str = "none") -> int:
+    """Add a job per keyword x period to the queue, split into week/day slices if requested.
+
+    Slices are ordered newest first like `plan_shards`, so a combined file
+    has the same row order as a sharded run. Returns the number of jobs added.
+    """
+    added = 0
+    for (s_date, e_date) in periods:
+        slices = None
+        if split != "none":
+            slices = sorted(split_period(s_date, e_date, 7 if split == "week" else 1), reverse=True)
+        for keyword in keywords:
+            added += queue.enqueue(keyword, s_date, e_date, slices)
+    return added
+
+
+def run_job(queue: JobQueue, job: Job, maxpage, workers: int, lease: Optional[LeaseKeeper] = None) -> str:
+    """Execute one leased job and return its output path.
+
+    Crawl jobs always resume from their checkpoint, so a job retried after
+    a failure or an expired lease continues where the last attempt stopped.
+    Output is only written while `lease` is held (see LeaseKeeper.check).
+    """
+    query = urllib.parse.quote(job.keyword)
+    if job.kind == "combine":
+        if lease is not None:
+            lease.check()
+        return combine_parts(queue.slice_results(job), output_path_for(query, job.s_date))
+    output_path = None
+    if (job.slice_start, job.slice_end) != (job.s_date, job.e_date):
+        output_path = shard_part_path(query, job.s_date, job.slice_start, job.slice_end)
+    return crawl_range(maxpage, query, job.slice_start, job.slice_end, workers, resume=True,
+                       output_path=output_path, seen=get_seen_index(job.s_date, job.e_date), lease=lease)
+
+
+def run_worker(queue: JobQueue, maxpage, workers: int, owner: Optional[str] = None,
+               poll: float = DEFAULT_QUEUE_POLL) -> int:
+    """Pull and run jobs until none are pending or leased by other workers.
+
+    Args:
+        queue (JobQueue): Shared job queue.
+        maxpage (int): Page limit per crawl job.
+        workers (int): Concurrent article fetchers per job.
+        owner (str): Lease owner name (default: host:pid).
+        poll (float): Seconds to wait when the remaining jobs are leased by
+            other workers, backing off after a failure or waiting for slices.
+
+    Returns:
+        int: Number of jobs this worker completed.
+    """
+    owner = owner or worker_name()
+    done = 0
+    while True:
+        job = queue.lease(owner)
+        if job is None:
+            counts = queue.counts()
+            if not counts["pending"] and not counts["leased"]:
+                break
+            time.sleep(poll)
+            continue
+        label = f"{job.kind} {job.keyword} {job.slice_start}~{job.slice_end}"
+        print(f"\n[{owner}] job {job.id}: {label} (attempt {job.attempts})")
+        try:
+            with LeaseKeeper(queue, job, owner) as lease:
+                result_path = run_job(queue, job, maxpage, workers, lease)
+        except LeaseLost as e:
+            # the job is another worker's now (or will be); leave its status alone
+            METRICS.inc("jobs_lease_lost_total")
+            print(f"[{owner}] job {job.id} abandoned: {e}")
+            continue
+        except Exception:
+            status = queue.fail(job, owner, traceback.format_exc())
+            METRICS.inc("jobs_failed_total")
+            print(f"[{owner}] job {job.id} failed ({status}):\n{traceback.format_exc()}")
+            continue
+        queue.complete(job, owner, result_path)
+        METRICS.inc("jobs_completed_total")
+        done += 1
+        print(f"[{owner}] job {job.id} done: {result_path} (queue: {queue.summary()})")
+    return done
+
+
+class AsyncLimits:
+    """Global and per-host concurrency caps for the async engine."""
+
+    def __init__(self, concurrency: int, per_host: int):
+        self.global_sem = asyncio.Semaphore(max(1, concurrency))
+        self.per_host = max(1, per_host)
+        self.host_sems: Dict[str, asyncio.Semaphore] = {}
+
+    @contextlib.asynccontextmanager
+    async def slot(self, url: str):
+        host = urllib.parse.urlsplit(url).netloc
+        host_sem = self.host_sems.setdefault(host, asyncio.Semaphore(self.per_host))
+        # host first: a task queued behind a busy host must not hold a global slot
+        async with host_sem, self.global_sem:
+            yield
+
+
+async def _fetch_async(url: str, limits: AsyncLimits) -> str:
+    async with limits.slot(url):
+        return await asyncio.to_thread(fetch_and_save, url)
+
+
+async def _article_content_async(news_url: str, limits: AsyncLimits,
+                                 seen: Optional[SeenArticleIndex] = None) -> str:
+    if not news_url:
+        return ''
+    if seen is not None:
+        known = seen.get(news_url)
+        if known is not None:
+            METRICS.inc("articles_reused_total")
+            return known
+    html = await _fetch_async(news_url, limits)
+    content = await asyncio.to_thread(parse_article_content, html)
+    if seen is not None and content:
+        seen.add(news_url, content)
+    return content
+
+
+async def crawler_async(maxpage, query, sort, s_date, e_date, limits: AsyncLimits,
+                        resume: bool = False) -> str:
+    """
+    Async counterpart of `crawler`: pages are walked in order, the article
+    bodies of each page are fetched concurrently within `limits`.
+
+    Returns:
+        str: Path to the saved output file.
+    """
+    seen = get_seen_index(s_date, e_date)
+    checkpoint, writer = await asyncio.to_thread(open_output, query, s_date, e_date, resume)
+    if writer is None:
+        return output_path_for(query, s_date)
+    pager = Pager(checkpoint.page_start, maxpage, writer.written_links() if writer.resumed else None)
+    s_from = s_date.replace(".", "")
+    e_to = e_date.replace(".", "")
+
+    while not pager.finished:
+        url = build_url(pager.page_start, query, s_date, e_date, s_from, e_to)
+        html = await _fetch_async(url, limits)
+        rows = pager.accept(html, await asyncio.to_thread(parse_result_page, html))
+        contents = await asyncio.gather(
+            *(_article_content_async(row['link'], limits, seen) for row in rows)
+        )
+        for row, content in zip(rows, contents):
+            row['contents'] = content
+        await asyncio.to_thread(commit_page, checkpoint, writer, pager.page_start, rows)
+        print(f'[{urllib.parse.unquote(query)}] accumulated rows:', writer.rows_written)
+    pager.close(urllib.parse.unquote(query))
+    return await asyncio.to_thread(finish_output, checkpoint, writer)
+
+
+async def crawl_all_async(jobs: List[Tuple[str, str, str]], maxpage: int,
+                          concurrency: int, per_host: int, resume: bool = False) -> List[str]:
+    """Crawl several (query, s_date, e_date) jobs at once on one event loop."""
+    loop = asyncio.get_running_loop()
+    # fetches run on the shared pooled session; size the executor to match
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=max(1, concurrency)))
+    limits = AsyncLimits(concurrency, per_host)
+    return await asyncio.gather(
+        *(crawler_async(maxpage, query, "1", s_date, e_date, limits, resume)
+          for query, s_date, e_date in jobs)
+    )
 
 
 # Helper to get start/end date for a given year and quarter
@@ -256,6 +1014,18 @@ def get_quarter_dates(year: int, quarter: int) -> Tuple[str, str]:
         raise ValueError("Quarter must be 1-4")
 
 
+def parse_int_range(text: str) -> List[int]:
+    """Parse "2019-2024", "1,3" or "2020,2022-2023" into a sorted list of integers."""
+    values = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        values.update(range(int(lo), int(hi or lo) + 1))
+    return sorted(values)
+
+
 def parse_keywords_arg(keywords_arg: List[str]) -> List[str]:
     """Normalize keywords from CLI. Supports multiple --keyword flags or comma-separated list.
     """
@@ -280,8 +1050,8 @@ def parse_keywords_arg(keywords_arg: List[str]) -> List[str]:
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Naver News Crawler (generalized CLI)")
-    parser.add_argument("--keywords", "--keyword", dest="keywords", nargs='+', required=True,
-                        help="검색 키워드(들). 공백으로 여러 개 지정하거나, 쉼표로 나열 가능")
+    parser.add_argument("--keywords", "--keyword", dest="keywords", nargs='+',
+                        help="검색 키워드(들). 공백으로 여러 개 지정하거나, 쉼표로 나열 가능 (--worker만 실행할 때는 생략)")
     parser.add_argument("--maxpage", type=int, default=200, help="페이지 수(페이지당 10건). 기본 200")
     # parser.add_argument("--sort", type=str, choices=["0", "1", "2"], default="1",
     #                     help="정렬: 0=관련성, 1=최신순(기본), 2=오래된순")
@@ -291,11 +1061,76 @@ if __name__ == "__main__":
     parser.add_argument("--end-date", type=str, help="종료일 YYYY.MM.DD 형식")
     parser.add_argument("--year", type=int, help="연도 (예: 2024)")
     parser.add_argument("--quarter", type=int, choices=[1, 2, 3, 4], help="분기 (1-4)")
+    parser.add_argument("--years", type=str, help="연도 범위/목록 (예: 2019-2024, 2020,2022). --quarters와 조합")
+    parser.add_argument("--quarters", type=str, help="분기 범위/목록 (예: 1-4, 1,3). --years만 주면 1-4 전체")
 
     parser.add_argument("--result-path", type=str, default=RESULT_PATH,
                         help="결과 CSV 저장 경로 (기본: out/naver_news_crawling_result/)")
-    parser.add_argument("--sleep-between", type=float, default=5.0,
-                        help="키워드 간 대기(초). 기본 5초")
+    parser.add_argument("--sleep-between", type=float, default=0.0,
+                        help="키워드 간 추가 대기(초). 요청 간격은 적응형 속도 제한기가 조절하므로 기본 0초")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"기사 본문 동시 수집 워커 수. 기본 {DEFAULT_WORKERS}")
+    parser.add_argument("--host-rate", type=float, default=DEFAULT_HOST_RATE,
+                        help=f"호스트별 초기 초당 요청 수(응답에 따라 자동 조절). 기본 {DEFAULT_HOST_RATE}")
+    parser.add_argument("--max-host-rate", type=float, default=DEFAULT_MAX_HOST_RATE,
+                        help=f"호스트별 초당 요청 수 상한. 기본 {DEFAULT_MAX_HOST_RATE}")
+    parser.add_argument("--max-retries", type=int, default=MAX_RETRIES,
+                        help=f"403/429/5xx/연결 오류 시 재시도 횟수(지수 백오프+지터). 기본 {MAX_RETRIES}")
+    parser.add_argument("--cache-dir", type=str, default=None,
+                        help="HTTP 응답 캐시 경로 (기본: <result-path>/.http_cache)")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_CACHE_MB,
+                        help=f"응답 캐시 디스크 용량 상한(MB). 기본 {DEFAULT_CACHE_MB}")
+    parser.add_argument("--search-ttl", type=float, default=DEFAULT_SEARCH_TTL,
+                        help=f"검색 결과 페이지 캐시 유효 시간(초). 기사 페이지는 만료되지 않음. 기본 {DEFAULT_SEARCH_TTL:g}")
+    parser.add_argument("--no-cache", action="store_true", help="응답 캐시 사용 안 함")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="키워드 간 중복 기사 본문 재사용 안 함 (기본: 같은 기간에 이미 수집한 기사 본문 재사용)")
+    parser.add_argument("--resume", action="store_true",
+                        help="중단된 키워드/기간을 마지막 체크포인트부터 이어서 수집 (완료된 작업은 건너뜀)")
+    parser.add_argument("--format", dest="output_format", choices=OUTPUT_FORMATS, default=OUTPUT_FORMAT,
+                        help="결과 파일 형식: csv(기본) 또는 parquet(압축 컬럼형, pyarrow 필요)")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="CSV와 함께 같은 이름의 JSON Lines(.jsonl) 파일도 저장")
+    parser.add_argument("--clean", action="store_true",
+                        help="저장 전에 페이지 단위로 본문 정제(기자 서명, 저작권 문구, 사진 설명, 이메일 제거)와 날짜 정규화(상대 날짜 포함)")
+    parser.add_argument("--store", type=str, default=None,
+                        help="결과를 SQLite 기사 저장소(링크 기준 중복 제거, 전문 검색 색인)에도 저장할 파일 경로. article_store.py로 조회")
+    archive = parser.add_mutually_exclusive_group()
+    archive.add_argument("--archive", type=str, default=None,
+                         help="받은 원본 HTML(검색 결과·기사 페이지)을 압축 아카이브(WARC 형식 + URL 오프셋 색인)로 저장할 폴더")
+    archive.add_argument("--replay", type=str, default=None,
+                         help="네트워크 요청 없이 --archive로 저장한 폴더의 HTML로 다시 파싱/추출 (선택자 변경 후 재추출). 캐시와 중복 본문 재사용은 끔")
+    parser.add_argument("--write-batch", type=int, default=WRITE_BATCH_SIZE,
+                        help=f"출력 파일에 한 번에 쓰는 행 수(페이지가 끝날 때마다 항상 flush). 기본 {WRITE_BATCH_SIZE}")
+    parser.add_argument("--parser", choices=BACKENDS, default="auto",
+                        help="HTML 파서 백엔드: auto(설치된 것 중 가장 빠른 것, 기본), selectolax, lxml, bs4")
+    parser.add_argument("--parse-procs", type=int, default=0,
+                        help="파싱 전용 프로세스 수. 0이면 수집 스레드에서 바로 파싱(기본)")
+    parser.add_argument("--shard", choices=SHARD_MODES, default="none",
+                        help="기간을 나눠 병렬 수집(sync 엔진): week, day, auto(페이지 상한에 걸리는 구간만 이분할). 기본 none")
+    parser.add_argument("--shard-parallel", type=int, default=DEFAULT_SHARD_PARALLEL,
+                        help=f"동시에 수집할 기간 구간 수. 기본 {DEFAULT_SHARD_PARALLEL}")
+    parser.add_argument("--engine", choices=["sync", "async"], default="sync",
+                        help="크롤링 엔진: sync=키워드 순차 실행(기본), async=키워드/기간을 하나의 이벤트 루프에서 동시 실행")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="async 엔진의 전체 동시 요청 수. 기본 16")
+    parser.add_argument("--metrics-interval", type=float, default=DEFAULT_METRICS_INTERVAL,
+                        help=f"수집 지표(JSON 한 줄)를 출력하는 주기(초). 0이면 끄기. 기본 {DEFAULT_METRICS_INTERVAL:g}")
+    parser.add_argument("--metrics-prom", type=str, default=None,
+                        help="Prometheus 텍스트 형식 지표 파일 경로 (주기마다, 종료 시 갱신)")
+    # 작업 큐: 키워드 x 기간 작업을 SQLite 큐에 넣고 여러 워커 프로세스(여러 서버 가능)가 나눠 수집
+    parser.add_argument("--queue", type=str, default=None,
+                        help="작업 큐(SQLite) 파일 경로. --keywords와 기간을 주면 작업을 추가하고, --worker면 큐에서 작업을 가져와 수집")
+    parser.add_argument("--worker", action="store_true", help="큐의 작업이 모두 끝날 때까지 가져와 수집")
+    parser.add_argument("--split", choices=QUEUE_SPLITS, default="none",
+                        help="큐에 넣을 때 기간을 week/day 구간 작업으로 나눔(구간이 모두 끝나면 합치는 작업이 실행됨). 기본 none")
+    parser.add_argument("--lease", type=float, default=DEFAULT_LEASE,
+                        help=f"워커가 작업을 점유하는 시간(초). 수집 중에는 자동 연장되고, 워커가 죽으면 만료 후 다른 워커가 이어받음. 기본 {DEFAULT_LEASE:g}")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help=f"작업 실패 시 최대 시도 횟수(지수 백오프 후 재시도). 기본 {DEFAULT_MAX_ATTEMPTS}")
+    parser.add_argument("--retry-failed", action="store_true", help="실패(failed) 상태 작업을 다시 대기 상태로 되돌림")
+    parser.add_argument("--poll", type=float, default=DEFAULT_QUEUE_POLL,
+                        help=f"다른 워커의 작업이 끝나길 기다릴 때 큐 확인 주기(초). 기본 {DEFAULT_QUEUE_POLL:g}")
 
     args = parser.parse_args()
 
@@ -304,33 +1139,144 @@ if __name__ == "__main__":
         RESULT_PATH = args.result_path
         os.makedirs(RESULT_PATH, exist_ok=True)
 
+    RATE_LIMITER = AdaptiveRateLimiter(args.host_rate, max_rate=args.max_host_rate)
+    MAX_RETRIES = max(0, args.max_retries)
+    DEDUP_ARTICLES = not args.no_dedup
+    PARSER = get_backend(args.parser)
+    if args.parse_procs > 0:
+        PARSER = ParsePool(args.parse_procs, args.parser, stats=PARSER.stats,
+                           max_pending=max(args.parse_procs, args.workers) * 2)
+    WRITE_JSONL = args.jsonl
+    OUTPUT_FORMAT = args.output_format
+    if OUTPUT_FORMAT == "parquet":
+        require_pyarrow()
+    WRITE_BATCH_SIZE = args.write_batch
+    CLEAN_ROWS = args.clean
+    if args.store:
+        ARTICLE_STORE = ArticleStore(args.store)
+    # One pooled keep-alive session shared by every keyword and period; with
+    # --shard each of the --shard-parallel ranges runs its own --workers fetches
+    shards_at_once = max(1, args.shard_parallel) if args.shard != "none" else 1
+    configure_session(pool_size=args.workers * shards_at_once)
+    if args.archive:
+        HTML_ARCHIVE = HtmlArchive(args.archive)
+    if args.replay:
+        # Every page comes from the archive: nothing to cache, and reused
+        # bodies from an earlier run would skip the re-parse
+        REPLAY_ARCHIVE = ArchiveReader(args.replay)
+        DEDUP_ARTICLES = False
+        print(f"Replaying from archive: {REPLAY_ARCHIVE.summary()}")
+    elif not args.no_cache:
+        RESPONSE_CACHE = ResponseCache(
+            args.cache_dir or os.path.join(RESULT_PATH, ".http_cache"),
+            max_bytes=args.cache_max_mb * 1024 * 1024,
+            ttls={"search": args.search_ttl, "article": None},
+        )
+
+    queue = None
+    if args.queue:
+        queue = JobQueue(args.queue, lease=args.lease, max_attempts=args.max_attempts)
+        if args.retry_failed:
+            print(f"Requeued {queue.retry_failed()} failed jobs")
+
     # Validate date/quarter selection
+    periods: List[Tuple[str, str]] = []
     if args.start_date and args.end_date:
-        periods: List[Tuple[str, str]] = [(args.start_date, args.end_date)]
-    elif args.year and args.quarter:
-        s_date, e_date = get_quarter_dates(args.year, args.quarter)
-        periods = [(s_date, e_date)]
-    else:
-        raise SystemExit("기간을 지정하세요: --start-date/--end-date 또는 --year/--quarter 중 하나")
+        periods = [(args.start_date, args.end_date)]
+    elif args.years or (args.year and (args.quarter or args.quarters)):
+        years = parse_int_range(args.years) if args.years else [args.year]
+        if args.quarters:
+            quarters = parse_int_range(args.quarters)
+        else:
+            quarters = [args.quarter] if args.quarter else [1, 2, 3, 4]
+        periods = [get_quarter_dates(year, quarter) for year in years for quarter in quarters]
 
     # Normalize keywords
-    keywords: List[str] = parse_keywords_arg(args.keywords)
-    if not keywords:
-        raise SystemExit("키워드를 하나 이상 지정하세요 (--keywords)")
+    keywords: List[str] = parse_keywords_arg(args.keywords or [])
+    # A queue worker or status call needs neither; crawling and enqueueing need both
+    if queue is None or args.keywords:
+        if not periods:
+            raise SystemExit("기간을 지정하세요: --start-date/--end-date, --year/--quarter 또는 --years[/--quarters]")
+        if not keywords:
+            raise SystemExit("키워드를 하나 이상 지정하세요 (--keywords)")
 
-    for (s_date, e_date) in periods:
-        print(f"\n{'#'*60}")
-        print(f"Processing: {s_date} ~ {e_date}")
-        print(f"{'#'*60}")
-        for keyword in keywords:
-            print(f"\n{'='*50}")
-            print(f"Processing keyword: {keyword}")
-            print(f"{'='*50}")
+    if queue is not None:
+        if keywords:
+            added = enqueue_jobs(queue, keywords, periods, args.split)
+            print(f"Enqueued {added} jobs ({len(keywords)} keywords x {len(periods)} periods, split {args.split})")
+        print(f"Queue {args.queue}: {queue.summary()}")
+        if not args.worker:
+            queue.close()
+            raise SystemExit(0)
 
-            # Build query as-is from the keyword for general use
-            query = urllib.parse.quote(f"{keyword}")
-            print(f"Encoded query: {query}")
+    METRICS.start_reporter(args.metrics_interval, args.metrics_prom)
+    run_started = time.perf_counter()
 
-            result_path = crawler(args.maxpage, query, args.sort, s_date, e_date)
+    if queue is not None:
+        completed = run_worker(queue, args.maxpage, args.workers, poll=args.poll)
+        print(f"\nWorker finished {completed} jobs (queue: {queue.summary()})")
+        queue.close()
+    elif args.engine == "async":
+        jobs = [(urllib.parse.quote(f"{keyword}"), s_date, e_date)
+                for (s_date, e_date) in periods for keyword in keywords]
+        print(f"Async engine: {len(jobs)} jobs, concurrency {args.concurrency}, per host {args.workers}")
+        for result_path in asyncio.run(crawl_all_async(jobs, args.maxpage, args.concurrency,
+                                                        args.workers, args.resume)):
             print(f"Results saved to: {result_path}")
-            time.sleep(max(0.0, args.sleep_between))
+    else:
+        for (s_date, e_date) in periods:
+            print(f"\n{'#'*60}")
+            print(f"Processing: {s_date} ~ {e_date}")
+            print(f"{'#'*60}")
+            for keyword in keywords:
+                print(f"\n{'='*50}")
+                print(f"Processing keyword: {keyword}")
+                print(f"{'='*50}")
+
+                # Build query as-is from the keyword for general use
+                query = urllib.parse.quote(f"{keyword}")
+                print(f"Encoded query: {query}")
+
+                # sort is fixed to latest (1) until the --sort flag is re-enabled
+                result_path = crawler(args.maxpage, query, "1", s_date, e_date,
+                                      workers=args.workers, resume=args.resume,
+                                      shard=args.shard, shard_parallel=args.shard_parallel)
+                print(f"Results saved to: {result_path}")
+                time.sleep(max(0.0, args.sleep_between))
+
+    print(f"\nConnection summary: {CONNECTION_STATS.summary()}")
+    print(f"Rate limiter: {RATE_LIMITER.summary()}")
+    print(f"Pagination: {PAGINATION_STATS.summary()}")
+    print(f"Parse summary ({PARSER.name}): {PARSER.stats.summary()}")
+    if CLEAN_ROWS:
+        snap = METRICS.snapshot()
+        chars = snap["counters"].get("cleanse_chars_total", 0)
+        seconds = snap["stages"].get("cleanse", {}).get("sum", 0.0)
+        print(f"Cleanse summary: {chars:,.0f} chars in {seconds:.2f} s "
+              f"({chars / seconds if seconds else 0:,.0f} chars/s)")
+    if isinstance(PARSER, ParsePool):
+        PARSER.close()
+    if RESPONSE_CACHE is not None:
+        print(f"Cache summary: {RESPONSE_CACHE.summary()}")
+    for (s_date, e_date), index in _seen_indexes.items():
+        print(f"Dedup {s_date} ~ {e_date}: {len(index)} articles indexed, {index.reused} bodies reused")
+    if HTML_ARCHIVE is not None:
+        print(f"Archive summary: {HTML_ARCHIVE.summary()}")
+        HTML_ARCHIVE.close()
+    if REPLAY_ARCHIVE is not None:
+        snap = METRICS.snapshot()
+        hits = snap["counters"].get("archive_hits_total", 0)
+        misses = snap["counters"].get("archive_misses_total", 0)
+        seconds = time.perf_counter() - run_started
+        print(f"Replay summary: {hits:.0f} pages from archive, {misses:.0f} missing, "
+              f"{seconds:.2f} s ({hits / seconds if seconds else 0:,.0f} pages/s)")
+        REPLAY_ARCHIVE.close()
+    if ARTICLE_STORE is not None:
+        for row in ARTICLE_STORE.stats():
+            print(f"Store {row['quarter']}: {row['articles']} articles, {row['keywords']} keywords")
+        ARTICLE_STORE.close()
+    METRICS.stop_reporter()
+    print(METRICS.report())
+    if args.metrics_prom:
+        METRICS.write_prometheus(args.metrics_prom)
+        print(f"Metrics written to: {args.metrics_prom}")
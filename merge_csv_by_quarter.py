@@ -4,49 +4,599 @@
 CSV Merger Utility for Naver News Crawling Results
 
 This script merges CSV files created by the crawler into quarterly consolidated files,
-removing duplicates based on the 'link' column.
+removing duplicates based on the 'link' column. Parquet files written with
+`main.py --format parquet` are merged the same way (requires pyarrow).
+
+With --chunked the merge runs out of core: files are streamed in chunks,
+duplicates are found with a compact set of link hashes, and the date order
+is produced by an external sort (sorted runs on disk + k-way merge), so
+memory stays within --memory-mb however many files are merged.
+
+With --near-dup the in-memory merge also clusters syndicated copies of the
+same story published under different links (MinHash + LSH over the article
+bodies, see near_dup.py) and keeps one canonical row per cluster, with
+`cluster_id` and `cluster_size` columns.
+
+With --store the quarter is read from the SQLite article store written by
+`main.py --store` instead: links are already unique there, so the merge is
+one indexed query streamed to the output file.
 """
 
 import pandas as pd
+import numpy as np
 import os
 import glob
+import csv
+import functools
+import hashlib
+import heapq
+import json
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import argparse
 import re
 
+from article_store import ArticleStore
+from near_dup import DEFAULT_NUM_PERM, DEFAULT_THRESHOLD, cluster_near_duplicates
+from result_catalog import ResultCatalog
+from row_writer import COLUMNS, RowWriter, crawl_time, format_dates, jsonl_to_parquet, parse_dates
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency, only needed for parquet files
+    pq = None
+
+# pandas' pyarrow CSV engine parses in parallel without holding the GIL
+CSV_ENGINE = 'pyarrow' if pq is not None else 'c'
+DEFAULT_LOAD_WORKERS = min(8, os.cpu_count() or 1)
+
+RESULT_EXTENSIONS = ('.csv', '.parquet')
+QUARTER_PREFIX = re.compile(r'^\d{2}Q[1-4]_$')
+OUTPUT_FORMATS = ('csv', 'parquet')
+
+# Chunked (out-of-core) merge settings
+DEFAULT_MEMORY_MB = 256
+DEFAULT_CHUNK_ROWS = 10000
+MERGE_FAN_IN = 64  # sorted runs merged at once
 
-def sort_data_by_date(df: pd.DataFrame, date_column: str = 'date') -> pd.DataFrame:
+# Incremental merge state kept next to the merged output
+MANIFEST_SUFFIX = '.manifest.json'
+LINK_INDEX_SUFFIX = '.links'  # 8-byte link hashes, little-endian uint64
+
+
+def sort_data_by_date(df: pd.DataFrame, date_column: str = 'date', as_text: bool = True) -> pd.DataFrame:
     """
     Sort the dataframe by date column.
     
     Args:
         df (pd.DataFrame): Input dataframe
         date_column (str): Name of the date column
+        as_text (bool): Convert dates back to "YYYY.MM.DD." text (for CSV output);
+            otherwise keep them as datetimes (for Parquet output)
     
     Returns:
         pd.DataFrame: Sorted dataframe
     """
-    # Convert date column to datetime for proper sorting
+    # Convert date column to datetime for proper sorting (skipped if already normalized)
     df_copy = df.copy()
-    
-    # Handle the date format (e.g., "2022.03.23." -> "2022-03-23")
-    df_copy[date_column] = df_copy[date_column].str.replace('.', '-').str.rstrip('-')
-    
-    # Convert to datetime
-    df_copy[date_column] = pd.to_datetime(df_copy[date_column], format='%Y-%m-%d', errors='coerce')
+    if not pd.api.types.is_datetime64_any_dtype(df_copy[date_column]):
+        df_copy[date_column] = parse_dates(df_copy[date_column])
     
     # Sort by date (newest first)
     df_copy = df_copy.sort_values(by=date_column, ascending=False)
     
     # Convert back to original format for consistency
-    df_copy[date_column] = df_copy[date_column].dt.strftime('%Y.%m.%d.')
+    if as_text:
+        df_copy[date_column] = format_dates(df_copy[date_column])
     
     return df_copy
 
 
+def sync_catalog(catalog: ResultCatalog, prefix: str = "") -> None:
+    """Add result files missing from the catalog, warning when catalog and directory differ."""
+    added, gone = catalog.sync(prefix)
+    if added:
+        print(f"Warning: {len(added)} result files were not in the catalog and have been added: "
+              f"{', '.join(added)}")
+    if gone:
+        print(f"Warning: {len(gone)} cataloged files no longer exist: {', '.join(gone)} "
+              f"(run with --rebuild-catalog to drop them)")
+
+
+def find_result_files(result_path: str, prefix: str) -> list:
+    """
+    Find crawler output files (CSV or Parquet) whose name starts with `prefix`.
+    
+    Quarter prefixes ("22Q1_") are looked up in the directory's catalog
+    (result_catalog.py) when there is one; other prefixes use a glob. Files
+    the catalog does not know about are added to it first (with a warning),
+    so the catalog never shrinks the merge input.
+    
+    Args:
+        result_path (str): Path to directory containing result files
+        prefix (str): Filename prefix, e.g. "22Q1_"
+    
+    Returns:
+        list: Sorted list of matching file paths
+    """
+    if QUARTER_PREFIX.match(prefix) and ResultCatalog.exists(result_path):
+        catalog = ResultCatalog(result_path)
+        sync_catalog(catalog, prefix)
+        names = [entry['name'] for entry in catalog.entries(prefix)]
+        catalog.close()
+        # parquet outputs of unfinished crawls are not written yet
+        return [path for path in (os.path.join(result_path, name) for name in names) if os.path.exists(path)]
+    files = []
+    for ext in RESULT_EXTENSIONS:
+        files.extend(glob.glob(os.path.join(result_path, f"{prefix}*{ext}")))
+    return sorted(files)
+
+
+def read_result_file(path: str, columns: list = None) -> pd.DataFrame:
+    """
+    Read a crawler output file, optionally only the given columns.
+    
+    Parquet files are read column-selectively, so reading only 'link' is cheap.
+    """
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=columns)
+    if CSV_ENGINE != 'c':
+        try:
+            return pd.read_csv(path, encoding='utf-8-sig', usecols=columns, engine=CSV_ENGINE)
+        except Exception:
+            pass  # fall back to the C parser (e.g. unusual quoting)
+    return pd.read_csv(path, encoding='utf-8-sig', usecols=columns)
+
+
+def load_result_files(files: list, workers: int = DEFAULT_LOAD_WORKERS, parquet_columns: list = None):
+    """
+    Read result files concurrently, yielding (path, DataFrame or Exception) in input order.
+    
+    The date column is normalized to datetimes while still in the worker,
+    with relative dates resolved against each file's crawl time.
+    `parquet_columns` limits what is read from Parquet files; CSV files are
+    always read whole, since they have to be parsed whole anyway.
+    """
+    def _load(path):
+        try:
+            df = read_result_file(path, columns=parquet_columns if path.endswith('.parquet') else None)
+            if 'date' in df.columns:
+                df['date'] = parse_dates(df['date'], reference=crawl_time(path))
+            return df
+        except Exception as e:
+            return e
+
+    if workers <= 1 or len(files) <= 1:
+        for path in files:
+            yield path, _load(path)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield from zip(files, pool.map(_load, files))
+
+
+def write_result_file(df: pd.DataFrame, path: str) -> None:
+    if path.endswith('.parquet'):
+        df.to_parquet(path, index=False, compression='zstd')
+    else:
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+
+
+def near_dedup(df: pd.DataFrame, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+               keep_all: bool = False) -> pd.DataFrame:
+    """
+    Cluster rows whose contents are near-duplicates and keep one canonical row per cluster.
+    
+    The canonical row is the earliest-dated one (then the first merged);
+    `cluster_id` is the hex link hash of the canonical row, shared by every
+    row of the cluster, and `cluster_size` counts its rows.
+    
+    Args:
+        df (pd.DataFrame): Merged rows with normalized (datetime) dates
+        threshold (float): Minimum estimated Jaccard similarity of the contents
+        num_perm (int): MinHash signature length
+        keep_all (bool): Keep every row (annotated) instead of canonical rows only
+    
+    Returns:
+        pd.DataFrame: Rows with cluster_id and cluster_size columns
+    """
+    started = datetime.now()
+    labels, stats = cluster_near_duplicates(df['contents'].fillna('').astype(str).tolist(), threshold, num_perm)
+    order = pd.DataFrame({'label': labels, 'date': df['date'].to_numpy(), 'position': np.arange(len(df))})
+    order = order.sort_values(['label', 'date', 'position'], na_position='last', kind='stable')
+    canonical = order.groupby('label', sort=False)['position'].first()
+    links = df['link'].to_numpy()
+    cluster_ids = {label: f"{_link_hash(links[pos]):016x}" for label, pos in canonical.items()}
+    sizes = pd.Series(labels).value_counts()
+    
+    df = df.copy()
+    df['cluster_id'] = [cluster_ids[label] for label in labels]
+    df['cluster_size'] = sizes.reindex(labels).to_numpy()
+    clusters = int((sizes > 1).sum())
+    if not keep_all:
+        df = df.iloc[np.sort(canonical.to_numpy())]
+    seconds = (datetime.now() - started).total_seconds()
+    print(f"Near-duplicates: {clusters} clusters, {int(sizes[sizes > 1].sum()) - clusters} copies "
+          f"{'marked' if keep_all else 'removed'} (threshold {threshold}, {stats['bands']} bands x "
+          f"{stats['rows']} rows, {stats['candidates']} candidate pairs, {seconds:.1f} s)")
+    return df
+
+
+def merge_result_files(files: list, output_path: str, workers: int = DEFAULT_LOAD_WORKERS,
+                       near_dup: float = 0.0, keep_near_dups: bool = False):
+    """
+    Merge result files into `output_path`, removing duplicate links and sorting by date.
+    
+    Files are read and their dates normalized concurrently by `workers`
+    threads. Duplicates are then detected file by file in input order
+    (keeping the first occurrence), so duplicate rows are dropped before the
+    frames are combined. For Parquet inputs only the 'link' column is read to
+    find them; full rows are then loaded only for files with new links.
+    
+    Args:
+        files (list): Input CSV/Parquet files
+        output_path (str): Output file; a .parquet extension writes Parquet
+        workers (int): Files read at once
+        near_dup (float): Similarity threshold for the near-duplicate pass (0: off)
+        keep_near_dups (bool): Keep near-duplicate copies, only marking their cluster
+    
+    Returns:
+        str: Path to the merged file, or None if nothing could be loaded
+    """
+    # Read and combine all files
+    frames = {}
+    link_only = {}  # Parquet files read for their links, with the rows to keep
+    seen_links = set()
+    before_dedup = 0
+    for file, df in load_result_files(files, workers, parquet_columns=['link']):
+        if isinstance(df, Exception):
+            print(f"  Error reading {file}: {df}")
+            continue
+        links = df['link']
+        before_dedup += len(links)
+        # set probes per row: Series.isin(set) would copy the whole set for every file
+        unseen = np.fromiter((link not in seen_links for link in links), dtype=bool, count=len(links))
+        keep = unseen & ~links.duplicated().to_numpy()
+        seen_links.update(links[keep])
+        if file.endswith('.parquet'):
+            if keep.any():
+                link_only[file] = keep
+        else:
+            frames[file] = df[keep]
+        print(f"  Loaded {len(links)} rows from {os.path.basename(file)} ({int(keep.sum())} new)")
+    for file, df in load_result_files(list(link_only), workers):
+        if isinstance(df, Exception):
+            print(f"  Error reading {file}: {df}")
+            continue
+        frames[file] = df[link_only[file]]
+    all_data = [frames[file] for file in files if file in frames]
+    
+    if not all_data:
+        print("No data could be loaded from result files")
+        return None
+    
+    # Combine all dataframes
+    combined_df = pd.concat(all_data, ignore_index=True)
+    print(f"Combined data: {before_dedup} rows")
+    
+    duplicates_removed = before_dedup - len(combined_df)
+    print(f"Duplicates removed: {duplicates_removed} rows")
+    if near_dup:
+        combined_df = near_dedup(combined_df, near_dup, keep_all=keep_near_dups)
+    print(f"Final data: {len(combined_df)} rows")
+    
+    # Sort by date
+    print("Sorting data by date...")
+    as_text = not output_path.endswith('.parquet')
+    combined_df = sort_data_by_date(combined_df, as_text=as_text)
+    
+    # Save merged data
+    write_result_file(combined_df, output_path)
+    print(f"Merged data saved to: {output_path}")
+    
+    return output_path
+
+
+def _link_hash(link) -> int:
+    """8-byte hash of a link; far smaller than keeping the URL strings."""
+    return int.from_bytes(hashlib.blake2b(str(link).encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def iter_result_chunks(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """
+    Yield a crawler output file as DataFrames of at most `chunk_rows` rows.
+    
+    CSV text is kept as-is (empty fields stay ''); Parquet dates stay typed.
+    """
+    if path.endswith('.parquet'):
+        if pq is None:
+            raise SystemExit("parquet 파일을 병합하려면 pyarrow가 필요합니다: pip install pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, encoding='utf-8-sig', chunksize=chunk_rows,
+                               dtype=str, keep_default_na=False)
+
+
+def _sorted_run(records: list, run_dir: str, index: int) -> str:
+    """Sort records by (date key, sequence) and spill them to a run file."""
+    records.sort(key=lambda r: (r[0], r[1]))
+    path = os.path.join(run_dir, f"run_{index:05d}.jsonl")
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return path
+
+
+def _read_run(path: str):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def _merge_runs(runs: list):
+    """k-way merge of sorted run files, yielding records in order."""
+    return heapq.merge(*(_read_run(run) for run in runs), key=lambda r: (r[0], r[1]))
+
+
+def merge_result_files_chunked(files: list, output_path: str, memory_mb: int = DEFAULT_MEMORY_MB,
+                               chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """
+    Out-of-core variant of `merge_result_files` with the same output.
+    
+    Files are streamed in chunks of `chunk_rows` rows. Rows whose link hash
+    was already seen are dropped; the rest are buffered until the buffer
+    reaches `memory_mb`, then sorted newest first and spilled to a run file
+    next to the output. The runs are combined with a k-way merge (at most
+    MERGE_FAN_IN at a time) while the output is written row by row.
+    
+    Args:
+        files (list): Input CSV/Parquet files
+        output_path (str): Output file; a .parquet extension writes Parquet
+        memory_mb (int): Budget for the in-memory sort buffer
+        chunk_rows (int): Rows read from an input file at a time
+    
+    Returns:
+        str: Path to the merged file, or None if nothing could be loaded
+    """
+    budget = max(1, memory_mb) * 1024 * 1024
+    seen_hashes = set()
+    before_dedup = kept = seq = 0
+    loaded = False
+    run_dir = tempfile.mkdtemp(prefix='.merge_runs_', dir=os.path.dirname(os.path.abspath(output_path)))
+    runs = []
+    buffer, buffer_bytes = [], 0
+    # Undated rows sort after every dated one, as NaT does in sort_data_by_date
+    undated_key = sys.maxsize
+    try:
+        for file in files:
+            file_rows = file_new = 0
+            try:
+                reference = crawl_time(file)
+                for chunk in iter_result_chunks(file, chunk_rows):
+                    chunk = chunk.reindex(columns=COLUMNS).fillna('')
+                    parsed = parse_dates(chunk['date'], reference=reference)
+                    day_keys = [-int(d.toordinal()) if not pd.isna(d) else undated_key for d in parsed]
+                    day_text = format_dates(parsed).fillna('')
+                    file_rows += len(chunk)
+                    for key, text, row in zip(day_keys, day_text, chunk.itertuples(index=False)):
+                        h = _link_hash(row.link)
+                        if h in seen_hashes:
+                            continue
+                        seen_hashes.add(h)
+                        record = [key, seq, text, str(row.title), str(row.source), str(row.contents),
+                                  str(row.link)]
+                        seq += 1
+                        file_new += 1
+                        buffer.append(record)
+                        buffer_bytes += sum(sys.getsizeof(v) for v in record) + sys.getsizeof(record)
+                        if buffer_bytes >= budget:
+                            runs.append(_sorted_run(buffer, run_dir, len(runs)))
+                            buffer, buffer_bytes = [], 0
+            except Exception as e:
+                print(f"  Error reading {file}: {e}")
+                continue
+            loaded = True
+            before_dedup += file_rows
+            kept += file_new
+            print(f"  Loaded {file_rows} rows from {os.path.basename(file)} ({file_new} new)")
+
+        if not loaded:
+            print("No data could be loaded from result files")
+            return None
+        if buffer:
+            runs.append(_sorted_run(buffer, run_dir, len(runs)))
+            buffer = []
+
+        print(f"Combined data: {before_dedup} rows")
+        print(f"Duplicates removed: {before_dedup - kept} rows")
+        print(f"Final data: {kept} rows")
+        print(f"Sorting data by date ({len(runs)} sorted runs)...")
+
+        # Reduce the number of runs until one merge pass can open them all
+        while len(runs) > MERGE_FAN_IN:
+            merged = []
+            for i in range(0, len(runs), MERGE_FAN_IN):
+                group = runs[i:i + MERGE_FAN_IN]
+                path = os.path.join(run_dir, f"pass_{len(runs)}_{i:05d}.jsonl")
+                with open(path, 'w', encoding='utf-8') as f:
+                    for record in _merge_runs(group):
+                        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                for run in group:
+                    os.remove(run)
+                merged.append(path)
+            runs = merged
+
+        if output_path.endswith('.parquet'):
+            staging = os.path.join(run_dir, 'merged.jsonl')
+            with open(staging, 'w', encoding='utf-8') as f:
+                for record in _merge_runs(runs):
+                    f.write(json.dumps(dict(zip(COLUMNS, record[2:])), ensure_ascii=False) + '\n')
+            jsonl_to_parquet(staging, output_path)
+        else:
+            with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(COLUMNS)
+                for record in _merge_runs(runs):
+                    writer.writerow(record[2:])
+    finally:
+        for name in os.listdir(run_dir):
+            os.remove(os.path.join(run_dir, name))
+        os.rmdir(run_dir)
+
+    print(f"Merged data saved to: {output_path}")
+    return output_path
+
+
+def _file_stat(path: str) -> dict:
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime': st.st_mtime}
+
+
+def _link_hashes(links) -> np.ndarray:
+    return np.fromiter((_link_hash(link) for link in links), dtype='<u8', count=len(links))
+
+
+def load_merge_state(output_path: str):
+    """
+    Return the manifest of an incrementally maintained merged file, or None.
+    
+    The manifest records every merged input (size, mtime, rows) and the size
+    of the merged output; it is discarded when the output or the link index
+    is missing or the output was modified outside the merger.
+    """
+    manifest_path = output_path + MANIFEST_SUFFIX
+    if not (os.path.exists(manifest_path) and os.path.exists(output_path)
+            and os.path.exists(output_path + LINK_INDEX_SUFFIX)):
+        return None
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('output_size') != os.path.getsize(output_path):
+        return None
+    return manifest
+
+
+def save_merge_state(output_path: str, manifest: dict) -> None:
+    manifest['output_size'] = os.path.getsize(output_path)
+    tmp = output_path + MANIFEST_SUFFIX + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, output_path + MANIFEST_SUFFIX)
+
+
+def rebuild_merge_state(files: list, stats: dict, output_path: str) -> None:
+    """Write the manifest and link index for a freshly (fully) merged output."""
+    entries = {}
+    for file in files:
+        try:
+            rows = len(read_result_file(file, columns=['link']))
+        except Exception:
+            continue
+        entries[os.path.basename(file)] = dict(stats[file], rows=rows)
+    links = read_result_file(output_path, columns=['link'])['link']
+    _link_hashes(links).tofile(output_path + LINK_INDEX_SUFFIX)
+    save_merge_state(output_path, {'files': entries, 'rows': len(links)})
+
+
+def merge_result_files_incremental(files: list, output_path: str, workers: int = DEFAULT_LOAD_WORKERS,
+                                   full_merge=None):
+    """
+    Update a merged CSV in place, reading only inputs added or changed since the last merge.
+    
+    Inputs whose size or mtime differ from the manifest are read, their rows
+    are checked against the persistent link index, and only unseen links are
+    appended (sorted newest first among themselves; run a full merge to
+    re-sort the whole file). Removed inputs, a modified or missing output,
+    or Parquet output trigger a full merge via `full_merge`, after which the
+    manifest and index are rebuilt.
+    
+    Args:
+        files (list): Input CSV/Parquet files
+        output_path (str): Merged CSV file
+        workers (int): Files read concurrently
+        full_merge (callable): `full_merge(files, output_path)` used for
+            rebuilds; defaults to merge_result_files
+    
+    Returns:
+        str: Path to the merged file, or None if nothing could be loaded
+    """
+    full_merge = full_merge or functools.partial(merge_result_files, workers=workers)
+    stats = {file: _file_stat(file) for file in files}
+    if output_path.endswith('.parquet'):
+        print("Incremental merge needs CSV output; running a full merge")
+        return full_merge(files, output_path)
+    manifest = load_merge_state(output_path)
+    names = {os.path.basename(file) for file in files}
+    if manifest is None or set(manifest['files']) - names:
+        reason = "no merge state" if manifest is None else "inputs were removed"
+        print(f"Full merge ({reason})...")
+        result = full_merge(files, output_path)
+        if result is not None:
+            rebuild_merge_state(files, stats, output_path)
+        return result
+
+    changed = [file for file in files
+               if {k: manifest['files'].get(os.path.basename(file), {}).get(k) for k in ('size', 'mtime')}
+               != stats[file]]
+    if not changed:
+        print(f"Merged file is up to date ({manifest['rows']} rows)")
+        return output_path
+    print(f"Incremental merge: {len(changed)} new or changed files")
+
+    index = np.fromfile(output_path + LINK_INDEX_SUFFIX, dtype='<u8')
+    new_data, new_hashes = [], []
+    for file, df in load_result_files(changed, workers):
+        if isinstance(df, Exception):
+            print(f"  Error reading {file}: {df}")
+            continue
+        hashes = _link_hashes(df['link'])
+        keep = ~np.isin(hashes, index) & ~pd.Series(hashes).duplicated().to_numpy()
+        index = np.concatenate([index, hashes[keep]])
+        new_data.append(df[keep])
+        new_hashes.append(hashes[keep])
+        manifest['files'][os.path.basename(file)] = dict(stats[file], rows=len(df))
+        print(f"  Loaded {len(df)} rows from {os.path.basename(file)} ({int(keep.sum())} new)")
+
+    added = sum(len(df) for df in new_data)
+    if added:
+        new_df = sort_data_by_date(pd.concat(new_data, ignore_index=True))
+        # the file already starts with a BOM; append plain UTF-8 without a header
+        new_df.to_csv(output_path, mode='a', header=False, index=False, encoding='utf-8')
+        with open(output_path + LINK_INDEX_SUFFIX, 'ab') as f:
+            np.concatenate(new_hashes).tofile(f)
+    manifest['rows'] += added
+    save_merge_state(output_path, manifest)
+    print(f"Appended {added} new rows ({manifest['rows']} total)")
+    print(f"Merged data saved to: {output_path}")
+    return output_path
+
+
+def _merge(files: list, output_path: str, chunked: bool, memory_mb: int, workers: int, incremental: bool,
+           near_dup: float = 0.0, keep_near_dups: bool = False):
+    if near_dup and (chunked or incremental):
+        # clustering needs every row's signature at once, and may drop rows already appended
+        raise ValueError("near-duplicate detection requires a full in-memory merge "
+                         "(not --chunked or --incremental)")
+    if chunked:
+        full_merge = functools.partial(merge_result_files_chunked, memory_mb=memory_mb)
+    else:
+        full_merge = functools.partial(merge_result_files, workers=workers, near_dup=near_dup,
+                                       keep_near_dups=keep_near_dups)
+    if incremental:
+        return merge_result_files_incremental(files, output_path, workers=workers, full_merge=full_merge)
+    return full_merge(files, output_path)
+
+
 def merge_csv_by_quarter(quarter_start_date: str, quarter_end_date: str, 
                          result_path: str = "out/naver_news_crawling_result/",
-                         output_filename: str = None):
+                         output_filename: str = None, output_format: str = 'csv',
+                         chunked: bool = False, memory_mb: int = DEFAULT_MEMORY_MB,
+                         workers: int = DEFAULT_LOAD_WORKERS, incremental: bool = False,
+                         near_dup: float = 0.0, keep_near_dups: bool = False):
     """
     Merges all CSV files from a given quarter into a single file, removing duplicates.
     
@@ -55,6 +605,15 @@ def merge_csv_by_quarter(quarter_start_date: str, quarter_end_date: str,
         quarter_end_date (str): End date in "YY.MM.DD" format (e.g., "22.03.31")
         result_path (str): Path to directory containing CSV files
         output_filename (str): Optional custom output filename
+        output_format (str): 'csv' or 'parquet' (used when output_filename is not given)
+        chunked (bool): Merge out of core (see merge_result_files_chunked)
+        memory_mb (int): Sort buffer budget for the chunked merge
+        workers (int): Files read concurrently (in-memory merge)
+        incremental (bool): Append only rows from new or changed files (see
+            merge_result_files_incremental)
+        near_dup (float): Similarity threshold for clustering near-duplicate
+            articles (see near_dedup); 0 disables it
+        keep_near_dups (bool): Keep the near-duplicate copies, marked by cluster
     
     Returns:
         str: Path to the merged CSV file
@@ -69,69 +628,35 @@ def merge_csv_by_quarter(quarter_start_date: str, quarter_end_date: str,
     
     # Pattern to match CSV files from this quarter
     # Files follow pattern: YY_MM_DD_MM_DD_*.csv
-    pattern = os.path.join(result_path, f"{start_date_clean}_{end_date_clean}_*.csv")
+    prefix = f"{start_date_clean}_{end_date_clean}_"
     
     # Find all matching CSV files
-    csv_files = glob.glob(pattern)
+    csv_files = find_result_files(result_path, prefix)
     
     if not csv_files:
         print(f"No CSV files found for quarter {quarter_start_date} to {quarter_end_date}")
-        print(f"Pattern searched: {pattern}")
+        print(f"Pattern searched: {os.path.join(result_path, prefix + '*')}")
         return None
     
     print(f"Found {len(csv_files)} CSV files to merge:")
     for file in csv_files:
         print(f"  - {os.path.basename(file)}")
     
-    # Read and combine all CSV files
-    all_data = []
-    for file in csv_files:
-        try:
-            df = pd.read_csv(file, encoding='utf-8-sig')
-            print(f"  Loaded {len(df)} rows from {os.path.basename(file)}")
-            all_data.append(df)
-        except Exception as e:
-            print(f"  Error reading {file}: {e}")
-            continue
-    
-    if not all_data:
-        print("No data could be loaded from CSV files")
-        return None
-    
-    # Combine all dataframes
-    combined_df = pd.concat(all_data, ignore_index=True)
-    print(f"Combined data: {len(combined_df)} rows")
-    
-    # Remove duplicates based on 'link' column
-    before_dedup = len(combined_df)
-    combined_df = combined_df.drop_duplicates(subset=['link'], keep='first')
-    after_dedup = len(combined_df)
-    duplicates_removed = before_dedup - after_dedup
-    
-    print(f"Duplicates removed: {duplicates_removed} rows")
-    print(f"Final data: {len(combined_df)} rows")
-    
-    # Sort by date
-    print("Sorting data by date...")
-    combined_df = sort_data_by_date(combined_df)
-    
     # Generate output filename if not provided
     if output_filename is None:
         # Use the same date format as input files
-        output_filename = f"merged_{quarter_start_date}_{quarter_end_date}_quarter.csv"
+        output_filename = f"merged_{quarter_start_date}_{quarter_end_date}_quarter.{output_format}"
     
     output_path = os.path.join(result_path, output_filename)
-    
-    # Save merged data
-    combined_df.to_csv(output_path, index=False, encoding='utf-8-sig')
-    print(f"Merged data saved to: {output_path}")
-    
-    return output_path
+    return _merge(csv_files, output_path, chunked, memory_mb, workers, incremental, near_dup, keep_near_dups)
 
 
 def merge_csv_by_quarter_name(year: int, quarter: int, 
                              result_path: str = "out/naver_news_crawling_result/",
-                             output_filename: str = None):
+                             output_filename: str = None, output_format: str = 'csv',
+                             chunked: bool = False, memory_mb: int = DEFAULT_MEMORY_MB,
+                             workers: int = DEFAULT_LOAD_WORKERS, incremental: bool = False,
+                             near_dup: float = 0.0, keep_near_dups: bool = False):
     """
     Merges all CSV files from a given quarter using the actual filename pattern.
     
@@ -140,6 +665,15 @@ def merge_csv_by_quarter_name(year: int, quarter: int,
         quarter (int): Quarter number (1, 2, 3, or 4)
         result_path (str): Path to directory containing CSV files
         output_filename (str): Optional custom output filename
+        output_format (str): 'csv' or 'parquet' (used when output_filename is not given)
+        chunked (bool): Merge out of core (see merge_result_files_chunked)
+        memory_mb (int): Sort buffer budget for the chunked merge
+        workers (int): Files read concurrently (in-memory merge)
+        incremental (bool): Append only rows from new or changed files (see
+            merge_result_files_incremental)
+        near_dup (float): Similarity threshold for clustering near-duplicate
+            articles (see near_dedup); 0 disables it
+        keep_near_dups (bool): Keep the near-duplicate copies, marked by cluster
     
     Returns:
         str: Path to the merged CSV file
@@ -151,63 +685,73 @@ def merge_csv_by_quarter_name(year: int, quarter: int,
     year_short = str(year)[-2:]
     
     # Pattern to match CSV files from this quarter
-    # Files follow pattern: 22Q1_*.csv
-    pattern = os.path.join(result_path, f"{year_short}Q{quarter}_*.csv")
+    # Files follow pattern: 22Q1_*.csv (or 22Q1_*.parquet)
+    prefix = f"{year_short}Q{quarter}_"
     
     # Find all matching CSV files
-    csv_files = glob.glob(pattern)
+    csv_files = find_result_files(result_path, prefix)
     
     if not csv_files:
         print(f"No CSV files found for quarter {year}Q{quarter}")
-        print(f"Pattern searched: {pattern}")
+        print(f"Pattern searched: {os.path.join(result_path, prefix + '*')}")
         return None
     
     print(f"Found {len(csv_files)} CSV files to merge:")
     for file in csv_files:
         print(f"  - {os.path.basename(file)}")
     
-    # Read and combine all CSV files
-    all_data = []
-    for file in csv_files:
-        try:
-            df = pd.read_csv(file, encoding='utf-8-sig')
-            print(f"  Loaded {len(df)} rows from {os.path.basename(file)}")
-            all_data.append(df)
-        except Exception as e:
-            print(f"  Error reading {file}: {e}")
-            continue
-    
-    if not all_data:
-        print("No data could be loaded from CSV files")
-        return None
-    
-    # Combine all dataframes
-    combined_df = pd.concat(all_data, ignore_index=True)
-    print(f"Combined data: {len(combined_df)} rows")
+    # Generate output filename if not provided
+    if output_filename is None:
+        output_filename = f"merged_{year_short}Q{quarter}_quarter.{output_format}"
     
-    # Remove duplicates based on 'link' column
-    before_dedup = len(combined_df)
-    combined_df = combined_df.drop_duplicates(subset=['link'], keep='first')
-    after_dedup = len(combined_df)
-    duplicates_removed = before_dedup - after_dedup
+    output_path = os.path.join(result_path, output_filename)
+    return _merge(csv_files, output_path, chunked, memory_mb, workers, incremental, near_dup, keep_near_dups)
+
+
+def merge_quarter_from_store(store_path: str, year: int, quarter: int,
+                             result_path: str = "out/naver_news_crawling_result/",
+                             output_filename: str = None, output_format: str = 'csv',
+                             keyword: str = None):
+    """
+    Write a quarter's articles from the article store (article_store.py), newest first.
     
-    print(f"Duplicates removed: {duplicates_removed} rows")
-    print(f"Final data: {len(combined_df)} rows")
+    The store keeps one row per link, so no deduplication pass is needed;
+    rows are streamed from an indexed query straight into the output file.
     
-    # Sort by date
-    print("Sorting data by date...")
-    combined_df = sort_data_by_date(combined_df)
+    Args:
+        store_path (str): Article store file (main.py --store)
+        year (int): Year (e.g., 2022)
+        quarter (int): Quarter number (1, 2, 3, or 4)
+        result_path (str): Directory of the output file
+        output_filename (str): Optional custom output filename
+        output_format (str): 'csv' or 'parquet' (used when output_filename is not given)
+        keyword (str): Only articles crawled with this keyword
     
-    # Generate output filename if not provided
+    Returns:
+        str: Path to the merged file, or None if the store has no rows for the quarter
+    """
+    os.makedirs(result_path, exist_ok=True)
+    label = f"{str(year)[-2:]}Q{quarter}"
     if output_filename is None:
-        output_filename = f"merged_{year_short}Q{quarter}_quarter.csv"
-    
+        output_filename = f"merged_{label}_quarter.{output_format}"
     output_path = os.path.join(result_path, output_filename)
     
-    # Save merged data
-    combined_df.to_csv(output_path, index=False, encoding='utf-8-sig')
+    started = datetime.now()
+    store = ArticleStore(store_path)
+    writer = RowWriter(output_path, batch_size=1000)
+    try:
+        for row in store.quarter_rows(label, keyword):
+            writer.write_rows([row])
+    finally:
+        writer.close()
+        store.close()
+    if not writer.rows_written:
+        os.remove(output_path)
+        print(f"No articles for {label} in {store_path}")
+        return None
+    seconds = (datetime.now() - started).total_seconds()
+    print(f"Merged {writer.rows_written} distinct articles from {store_path} in {seconds:.2f} s")
     print(f"Merged data saved to: {output_path}")
-    
     return output_path
 
 
@@ -237,19 +781,71 @@ def get_quarter_dates(year: int, quarter: int):
         raise ValueError("Quarter must be 1, 2, 3, or 4")
 
 
-def list_available_quarters(result_path: str = "out/naver_news_crawling_result/"):
+def _megabytes(size) -> str:
+    return f"{(size or 0) / (1024 * 1024):,.1f} MB"
+
+
+def _date_span(date_min, date_max) -> str:
+    if not date_min:
+        return "no dates"
+    return f"{date_min.replace('-', '.')} ~ {date_max.replace('-', '.')}"
+
+
+def list_catalog(result_path: str, year: int = None, quarter: int = None):
+    """
+    Print quarters (or one quarter's files) with row counts, sizes and date ranges from the catalog.
+    """
+    catalog = ResultCatalog(result_path)
+    try:
+        if year and quarter:
+            prefix = f"{str(year)[-2:]}Q{quarter}_"
+            sync_catalog(catalog, prefix)
+            entries = catalog.entries(prefix)
+            print(f"Files for {year} Q{quarter}:")
+            for e in entries:
+                state = "" if e['complete'] else " (in progress)"
+                print(f"  {e['name']}: {e['rows']:,} rows, {_megabytes(e['size'])}, "
+                      f"{_date_span(e['date_min'], e['date_max'])}{state}")
+            if not entries:
+                print("  (none)")
+            return
+        sync_catalog(catalog)
+        quarters = catalog.quarters()
+        if not quarters:
+            print("No result files in catalog")
+            return
+        print("Available quarters:")
+        for q in quarters:
+            state = f", {q['incomplete']} in progress" if q['incomplete'] else ""
+            print(f"  20{q['quarter'][:2]} Q{q['quarter'][-1]}: {q['files']} files, {q['rows'] or 0:,} rows, "
+                  f"{_megabytes(q['size'])}, {_date_span(q['date_min'], q['date_max'])}{state}")
+    finally:
+        catalog.close()
+
+
+def list_available_quarters(result_path: str = "out/naver_news_crawling_result/",
+                            year: int = None, quarter: int = None):
     """
     List all available quarters that have CSV files.
     
+    Uses the directory's catalog when present (instant, with row counts,
+    sizes and date ranges); otherwise falls back to scanning file names.
+    
     Args:
         result_path (str): Path to directory containing CSV files
+        year (int): With `quarter`, list that quarter's files (catalog only)
+        quarter (int): Quarter number (1-4)
     """
     if not os.path.exists(result_path):
         print(f"Result path does not exist: {result_path}")
         return
     
-    # Find all CSV files
-    csv_files = glob.glob(os.path.join(result_path, "*.csv"))
+    if ResultCatalog.exists(result_path):
+        list_catalog(result_path, year, quarter)
+        return
+    
+    # Find all CSV/Parquet files
+    csv_files = find_result_files(result_path, "")
     
     if not csv_files:
         print("No CSV files found")
@@ -272,6 +868,7 @@ def list_available_quarters(result_path: str = "out/naver_news_crawling_result/"
         print("Available quarters:")
         for year, quarter in sorted(quarters):
             print(f"  20{year} Q{quarter}")
+        print("(no catalog: run with --rebuild-catalog to see row counts and sizes)")
     else:
         print("No quarters could be extracted from filenames")
 
@@ -285,25 +882,77 @@ def main():
     parser.add_argument('--result-path', type=str, default='out/naver_news_crawling_result/',
                        help='Path to directory containing CSV files')
     parser.add_argument('--output', type=str, help='Custom output filename')
-    parser.add_argument('--list', action='store_true', help='List available quarters')
+    parser.add_argument('--list', action='store_true',
+                       help="List available quarters (with --year/--quarter: that quarter's files)")
+    parser.add_argument('--rebuild-catalog', action='store_true',
+                       help='Re-scan the result directory into its catalog (for files written '
+                            'before the catalog existed)')
+    parser.add_argument('--format', dest='output_format', choices=OUTPUT_FORMATS, default='csv',
+                       help='Output format of the merged file (parquet requires pyarrow)')
+    parser.add_argument('--chunked', action='store_true',
+                       help='Out-of-core merge: stream files in chunks and sort on disk')
+    parser.add_argument('--memory-mb', type=int, default=DEFAULT_MEMORY_MB,
+                       help=f'Sort buffer budget in MB for --chunked (default {DEFAULT_MEMORY_MB})')
+    parser.add_argument('--load-workers', type=int, default=DEFAULT_LOAD_WORKERS,
+                       help=f'Files read concurrently (default {DEFAULT_LOAD_WORKERS})')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Append only rows from new or changed files, using the manifest and '
+                            'link index kept next to the merged CSV')
+    parser.add_argument('--near-dup', type=float, nargs='?', const=DEFAULT_THRESHOLD, default=0.0,
+                       metavar='THRESHOLD',
+                       help='Cluster near-duplicate articles (syndicated copies under other links) '
+                            'by contents similarity and keep one row per cluster; optional '
+                            f'threshold 0-1 (default {DEFAULT_THRESHOLD})')
+    parser.add_argument('--store', type=str,
+                       help='Merge from the SQLite article store written by main.py --store '
+                            '(indexed query; needs --year/--quarter)')
+    parser.add_argument('--keyword', type=str, help='With --store, only articles of this crawl keyword')
+    parser.add_argument('--keep-near-dups', action='store_true',
+                       help='With --near-dup, keep every copy and only mark its cluster_id')
     
     args = parser.parse_args()
+    if args.near_dup and (args.chunked or args.incremental):
+        parser.error('--near-dup needs the in-memory merge (not --chunked or --incremental)')
+    if not 0 <= args.near_dup <= 1:
+        parser.error('--near-dup threshold must be between 0 and 1')
+    if args.store and (args.chunked or args.incremental or args.near_dup):
+        parser.error('--store cannot be combined with --chunked, --incremental or --near-dup')
+    
+    if args.rebuild_catalog:
+        catalog = ResultCatalog(args.result_path)
+        count = catalog.rebuild()
+        catalog.close()
+        print(f"Catalog rebuilt: {count} result files")
+        if not args.list:
+            return
     
     if args.list:
-        list_available_quarters(args.result_path)
+        list_available_quarters(args.result_path, args.year, args.quarter)
         return
     
     # Determine dates
-    if args.start_date and args.end_date:
+    if args.store:
+        if not (args.year and args.quarter):
+            parser.error('--store needs --year and --quarter')
+        print(f"Merging {args.year} Q{args.quarter} from article store {args.store}")
+        result = merge_quarter_from_store(args.store, args.year, args.quarter, args.result_path,
+                                          args.output, args.output_format, args.keyword)
+    elif args.start_date and args.end_date:
         start_date = args.start_date
         end_date = args.end_date
         print(f"Merging CSV files for period: {start_date} to {end_date}")
         # Merge the files using date range
-        result = merge_csv_by_quarter(start_date, end_date, args.result_path, args.output)
+        result = merge_csv_by_quarter(start_date, end_date, args.result_path, args.output,
+                                      args.output_format, args.chunked, args.memory_mb,
+                                      args.load_workers, args.incremental, args.near_dup,
+                                      args.keep_near_dups)
     elif args.year and args.quarter:
         print(f"Merging CSV files for {args.year} Q{args.quarter}")
         # Merge the files using quarter
-        result = merge_csv_by_quarter_name(args.year, args.quarter, args.result_path, args.output)
+        result = merge_csv_by_quarter_name(args.year, args.quarter, args.result_path, args.output,
+                                           args.output_format, args.chunked, args.memory_mb,
+                                           args.load_workers, args.incremental, args.near_dup,
+                                           args.keep_near_dups)
     else:
         print("Please provide either --start-date and --end-date, or --year and --quarter")
         print("Use --help for more information")
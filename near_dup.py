@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Near-duplicate article detection with MinHash and LSH
+
+- Article bodies are reduced to character k-shingles (whitespace and
+  punctuation removed), hashed with a vectorized rolling hash and
+  summarized by a MinHash signature of `num_perm` values (multiply-shift
+  hash family), so the cost per row depends only on its length
+- Signatures are cut into bands; rows whose band values are equal share an
+  LSH bucket and become candidate pairs with the bucket's first row. Only
+  candidates are compared (estimated Jaccard similarity of signatures), so
+  the pass is linear in the number of rows instead of quadratic
+- Candidates at or above the threshold are joined into clusters (union-find)
+"""
+
+import re
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 128
+SHINGLE_SIZE = 5  # characters
+MIN_CHARS = 50  # shorter bodies (empty, failed fetches) never cluster
+MAX_CHARS = 3000  # only the start of long bodies is shingled
+MIN_RECALL = 0.9  # candidate probability for pairs exactly at the threshold
+
+_NON_WORD = re.compile(r"[\W_]+")
+_ROLL = np.uint64(1000003)
+_SHIFT = np.uint64(32)
+_PAIR_BATCH = 100000
+
+
+def lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Choose (bands, rows per band) for a similarity threshold.
+
+    Takes the most rows per band (fewest false candidates) that still makes
+    a pair exactly at the threshold a candidate with probability MIN_RECALL.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= MIN_RECALL:
+            best = (bands, rows)
+    return best
+
+
+def shingle_hashes(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    """64-bit hashes of every k-character shingle of `text` (polynomial rolling hash)."""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    n = len(codes) - k + 1
+    if n <= 0:
+        return np.empty(0, dtype=np.uint64)
+    hashes = codes[:n].copy()
+    for j in range(1, k):
+        hashes = hashes * _ROLL + codes[j:j + n]  # wraps modulo 2**64
+    return hashes
+
+
+def _normalize(text: str) -> str:
+    return _NON_WORD.sub("", text).lower()[:MAX_CHARS]
+
+
+def minhash_signatures(texts: Sequence[str], num_perm: int = DEFAULT_NUM_PERM,
+                       seed: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """MinHash signatures of `texts`.
+
+    Returns:
+        tuple: (signatures as an (n, num_perm) uint32 array, boolean mask of
+            rows long enough to be compared)
+    """
+    rng = np.random.default_rng(seed)
+    a = (rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    signatures = np.full((len(texts), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    valid = np.zeros(len(texts), dtype=bool)
+    for i, text in enumerate(texts):
+        text = _normalize(text or "")
+        if len(text) < MIN_CHARS:
+            continue
+        hashes = shingle_hashes(text)
+        # multiply-shift: the high 32 bits of a*h + b (mod 2**64) per permutation
+        signatures[i] = ((a[:, None] * hashes[None, :] + b[:, None]) >> _SHIFT).min(axis=1)
+        valid[i] = True
+    return signatures, valid
+
+
+def _band_keys(band: np.ndarray) -> np.ndarray:
+    """One 64-bit key per row for a band of signature columns."""
+    keys = np.zeros(len(band), dtype=np.uint64)
+    for column in band.T:
+        keys = (keys ^ column.astype(np.uint64)) * np.uint64(0x100000001B3)
+    return keys
+
+
+def candidate_pairs(signatures: np.ndarray, valid: np.ndarray, bands: int, rows: int) -> np.ndarray:
+    """Distinct (row, bucket representative) pairs sharing at least one LSH bucket."""
+    index = np.flatnonzero(valid)
+    pairs = []
+    for band in range(bands):
+        keys = _band_keys(signatures[index, band * rows:(band + 1) * rows])
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        representative = index[first[inverse]]
+        linked = representative != index
+        pairs.append(np.stack([index[linked], representative[linked]], axis=1))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.unique(np.concatenate(pairs), axis=0)
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_near_duplicates(texts: Sequence[str], threshold: float = DEFAULT_THRESHOLD,
+                            num_perm: int = DEFAULT_NUM_PERM) -> Tuple[np.ndarray, dict]:
+    """Cluster near-duplicate texts.
+
+    Args:
+        texts: Article bodies.
+        threshold (float): Minimum estimated Jaccard similarity of shingle sets.
+        num_perm (int): MinHash signature length.
+
+    Returns:
+        tuple: (cluster label per text: the smallest index in its cluster,
+            stats dict with bands, rows, candidates and matched pairs)
+    """
+    signatures, valid = minhash_signatures(texts, num_perm)
+    bands, rows = lsh_params(threshold, num_perm)
+    pairs = candidate_pairs(signatures, valid, bands, rows)
+    parent = list(range(len(texts)))
+    matched = 0
+    for start in range(0, len(pairs), _PAIR_BATCH):
+        batch = pairs[start:start + _PAIR_BATCH]
+        similarity = (signatures[batch[:, 0]] == signatures[batch[:, 1]]).mean(axis=1)
+        for i, j in batch[similarity >= threshold]:
+            ri, rj = _find(parent, int(i)), _find(parent, int(j))
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+            matched += 1
+    labels = np.fromiter((_find(parent, i) for i in range(len(texts))), dtype=np.int64, count=len(texts))
+    return labels, {"bands": bands, "rows": rows, "candidates": len(pairs), "matched": matched}
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Process-pool parsing stage for the crawler
+
+Fetch threads hand raw HTML to a pool of worker processes, each holding its
+own parser backend, so parsing is not limited to one core by the GIL.
+The number of HTML documents waiting to be parsed is bounded: submitting
+blocks once `max_pending` jobs are queued, which slows the fetchers down
+instead of letting raw pages pile up in memory.
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from html_parsers import ParseStats, get_backend
+
+_backend = None
+
+
+def _init_worker(backend_name: str) -> None:
+    global _backend
+    _backend = get_backend(backend_name)
+
+
+def _parse_rows(html: str) -> Tuple[List[dict], float]:
+    t0 = time.perf_counter()
+    rows = _backend.news_rows(html)
+    return rows, time.perf_counter() - t0
+
+
+def _parse_body(html: str) -> Tuple[str, float]:
+    t0 = time.perf_counter()
+    text = _backend.article_body(html)
+    return text, time.perf_counter() - t0
+
+
+class ParsePool:
+    """Parse result and article pages in worker processes.
+
+    Args:
+        procs (int): Number of worker processes.
+        backend_name (str): Parser backend used by each worker (see html_parsers.BACKENDS).
+        stats (ParseStats): Where worker parse times are accumulated.
+        max_pending (int): Maximum parse jobs queued or running at once.
+    """
+
+    def __init__(self, procs: int, backend_name: str = "auto",
+                 stats: Optional[ParseStats] = None, max_pending: Optional[int] = None):
+        self.name = f"{get_backend(backend_name).name} x{procs} procs"
+        self.stats = stats or ParseStats()
+        # spawn: workers only need html_parsers, and forking a threaded crawler is unsafe
+        self._pool = ProcessPoolExecutor(max_workers=procs, mp_context=multiprocessing.get_context("spawn"),
+                                         initializer=_init_worker, initargs=(backend_name,))
+        self._slots = threading.BoundedSemaphore(max_pending or procs * 4)
+
+    def _submit(self, fn, html: str) -> Future:
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(fn, html)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def submit_article_body(self, html: str) -> Future:
+        """Queue an article page; the future resolves to its body text."""
+        inner = self._submit(_parse_body, html)
+        outer: Future = Future()
+
+        def _done(f: Future) -> None:
+            try:
+                text, seconds = f.result()
+            except Exception as e:
+                outer.set_exception(e)
+                return
+            self.stats.record_article(seconds)
+            outer.set_result(text)
+
+        inner.add_done_callback(_done)
+        return outer
+
+    def article_body(self, html: str) -> str:
+        return self.submit_article_body(html).result()
+
+    def news_rows(self, html: str) -> List[dict]:
+        rows, seconds = self._submit(_parse_rows, html).result()
+        self.stats.record_page(seconds)
+        return rows
+
+    def close(self) -> None:
+        self._pool.shutdown()
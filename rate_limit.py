@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Adaptive per-host rate limiting for the crawler
+
+- Token bucket per host; the refill rate adapts AIMD-style: it grows by a
+  fixed step after fast successful responses and is cut by a factor on
+  403/429/5xx responses, connection errors or slow responses
+- Exponential backoff with full jitter for retries
+- Circuit breaker: after several consecutive failures a host is paused for
+  a cooldown period before requests are let through again
+"""
+
+import random
+import threading
+import time
+import urllib.parse
+from typing import Dict, Optional
+
+# Responses that mean "slow down" rather than "this page does not exist"
+THROTTLE_STATUSES = frozenset({403, 429, 500, 502, 503, 504})
+
+
+class _HostState:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.failures = 0
+        self.open_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.breaker_trips = 0
+
+
+class AdaptiveRateLimiter:
+    """Per-host token bucket whose rate follows the server's responses.
+
+    Args:
+        initial_rate (float): Starting requests per second per host.
+        min_rate (float): Lower bound for the rate after decreases.
+        max_rate (float): Upper bound for the rate after increases.
+        increase (float): Requests/s added after each fast success.
+        decrease (float): Factor the rate is multiplied by on a throttle signal.
+        slow_latency (float): Responses slower than this (s) count as a soft
+            throttle signal and decrease the rate.
+        burst (float): Bucket capacity (requests that may start back to back).
+        breaker_threshold (int): Consecutive failures that open the breaker.
+        breaker_cooldown (float): Seconds a host stays paused once opened.
+        base_backoff (float): First retry delay cap (s); doubles per attempt.
+        max_backoff (float): Upper bound for a single retry delay (s).
+    """
+
+    def __init__(self, initial_rate: float = 5.0, min_rate: float = 0.2, max_rate: float = 20.0,
+                 increase: float = 0.25, decrease: float = 0.5, slow_latency: float = 5.0,
+                 burst: float = 1.0, breaker_threshold: int = 5, breaker_cooldown: float = 60.0,
+                 base_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, initial_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_latency = slow_latency
+        self.burst = burst
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostState] = {}
+
+    def _state(self, url: str) -> _HostState:
+        host = urllib.parse.urlsplit(url).netloc
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.initial_rate, self.burst)
+        return state
+
+    def acquire(self, url: str) -> None:
+        """Block until a request to the URL's host may start."""
+        if self.initial_rate <= 0:
+            return
+        while True:
+            with self._lock:
+                state = self._state(url)
+                now = time.monotonic()
+                if now < state.open_until:
+                    delay = state.open_until - now
+                else:
+                    state.tokens = min(self.burst, state.tokens + (now - state.updated) * state.rate)
+                    state.updated = now
+                    if state.tokens >= 1.0:
+                        state.tokens -= 1.0
+                        state.requests += 1
+                        return
+                    delay = (1.0 - state.tokens) / state.rate
+            time.sleep(delay)
+
+    def record(self, url: str, status: int, latency: float) -> bool:
+        """Feed a response back into the host's rate.
+
+        Args:
+            status (int): HTTP status, or 0 for a connection error / timeout.
+            latency (float): Seconds the request took.
+
+        Returns:
+            bool: True if the response is a throttle signal worth retrying.
+        """
+        throttled = status == 0 or status in THROTTLE_STATUSES
+        with self._lock:
+            state = self._state(url)
+            if throttled:
+                state.throttled += 1
+                state.failures += 1
+                state.rate = max(self.min_rate, state.rate * self.decrease)
+                if state.failures >= self.breaker_threshold:
+                    state.open_until = time.monotonic() + self.breaker_cooldown
+                    state.breaker_trips += 1
+                    state.failures = 0
+            else:
+                state.failures = 0
+                if latency > self.slow_latency:
+                    state.rate = max(self.min_rate, state.rate * self.decrease)
+                else:
+                    state.rate = min(self.max_rate, state.rate + self.increase)
+        return throttled
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry number `attempt` (0-based): full jitter over an exponential cap."""
+        delay = random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(self.max_backoff, retry_after))
+        return delay
+
+    def summary(self) -> str:
+        with self._lock:
+            parts = [
+                f"{host}: {s.requests} req, {s.throttled} throttled, {s.breaker_trips} breaker trips, "
+                f"rate {s.rate:.2f}/s"
+                for host, s in sorted(self._hosts.items())
+            ]
+        return "; ".join(parts) if parts else "no requests"
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Catalog of crawler output files in a result directory
+
+- One SQLite file per result directory (`.catalog.sqlite`), updated by the
+  crawler every time it commits a page and when an output is finished
+- Per output file: keyword, quarter, format, row count, date range, byte
+  size and whether the crawl finished
+- Lets merge_csv_by_quarter.py list quarters and pick input files without
+  globbing and reading thousands of files
+- Files written before the catalog existed can be added with `rebuild`;
+  `sync` adds output files the catalog does not know about yet
+"""
+
+import datetime
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from row_writer import parse_date, read_csv_rows
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency, only needed for parquet files
+    pq = None
+
+CATALOG_NAME = ".catalog.sqlite"
+
+# Keyword output files: {YY}Q{n}_{keyword}.{csv|parquet}
+RESULT_NAME = re.compile(r"^(\d{2})Q([1-4])_(.+)\.(csv|parquet)$")
+
+
+def parse_result_name(name: str) -> Optional[Dict[str, str]]:
+    """Return quarter ("24Q1"), keyword and format of an output file name, or None."""
+    m = RESULT_NAME.match(name)
+    if not m:
+        return None
+    return {"quarter": f"{m.group(1)}Q{m.group(2)}", "keyword": m.group(3), "format": m.group(4)}
+
+
+def _day(d: Optional[datetime.date]) -> Optional[str]:
+    return d.isoformat() if d is not None else None
+
+
+class ResultCatalog:
+    """SQLite catalog of the keyword output files in `root`.
+
+    Args:
+        root (str): Result directory (the crawler's RESULT_PATH).
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        # several crawler processes may share a result directory
+        self._db = sqlite3.connect(os.path.join(root, CATALOG_NAME), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " name TEXT PRIMARY KEY, keyword TEXT, quarter TEXT, format TEXT, rows INTEGER,"
+            " date_min TEXT, date_max TEXT, size INTEGER, complete INTEGER, updated_at REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS files_quarter ON files(quarter)")
+        self._db.commit()
+
+    @staticmethod
+    def exists(root: str) -> bool:
+        return os.path.exists(os.path.join(root, CATALOG_NAME))
+
+    def record(self, path: str, rows: int, size: int, date_min: Optional[datetime.date] = None,
+               date_max: Optional[datetime.date] = None, complete: bool = False,
+               extend_range: bool = False) -> bool:
+        """Insert or update the entry of an output file.
+
+        Args:
+            path (str): Output file; files not named {YY}Q{n}_{keyword}.{ext}
+                (e.g. shard parts) are ignored.
+            rows (int): Rows written so far.
+            size (int): Bytes written so far.
+            date_min, date_max (date): Range of the dates written.
+            complete (bool): The crawl of this file finished.
+            extend_range (bool): Widen the stored date range instead of
+                replacing it (resumed crawls only see their new rows).
+
+        Returns:
+            bool: True if the file was recorded.
+        """
+        name = os.path.basename(path)
+        info = parse_result_name(name)
+        if info is None:
+            return False
+        lo, hi = _day(date_min), _day(date_max)
+        with self._lock:
+            if extend_range:
+                row = self._db.execute("SELECT date_min, date_max FROM files WHERE name = ?", (name,)).fetchone()
+                if row is not None:
+                    lo = min(filter(None, (lo, row[0])), default=None)
+                    hi = max(filter(None, (hi, row[1])), default=None)
+            self._db.execute(
+                "INSERT OR REPLACE INTO files (name, keyword, quarter, format, rows, date_min, date_max,"
+                " size, complete, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (name, info["keyword"], info["quarter"], info["format"], rows, lo, hi, size,
+                 int(complete), time.time()),
+            )
+            self._db.commit()
+        return True
+
+    def entries(self, prefix: str = "") -> List[dict]:
+        """Catalog entries whose file name starts with `prefix`, sorted by name."""
+        with self._lock:
+            cur = self._db.execute(
+                "SELECT name, keyword, quarter, format, rows, date_min, date_max, size, complete"
+                " FROM files WHERE substr(name, 1, ?) = ? ORDER BY name", (len(prefix), prefix))
+            columns = [c[0] for c in cur.description]
+            return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+    def quarters(self) -> List[dict]:
+        """Per-quarter totals: files, rows, bytes and date range."""
+        with self._lock:
+            cur = self._db.execute(
+                "SELECT quarter, COUNT(*) AS files, SUM(rows) AS rows, SUM(size) AS size,"
+                " MIN(date_min) AS date_min, MAX(date_max) AS date_max,"
+                " SUM(complete = 0) AS incomplete FROM files GROUP BY quarter ORDER BY quarter")
+            columns = [c[0] for c in cur.description]
+            return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM files WHERE name = ?", (name,))
+            self._db.commit()
+
+    def _scan(self, name: str) -> None:
+        """Read an output file to catalog its rows and date range (as a finished crawl)."""
+        path = os.path.join(self.root, name)
+        rows, lo, hi = 0, None, None
+        if name.endswith(".parquet"):
+            if pq is None:
+                raise SystemExit("parquet 파일을 읽으려면 pyarrow가 필요합니다: pip install pyarrow")
+            dates = pq.read_table(path, columns=["date"]).column("date").to_pylist()
+            rows = len(dates)
+            dates = [d for d in dates if d is not None]
+        else:
+            dates = []
+            for row in read_csv_rows(path):
+                rows += 1
+                d = parse_date(row.get("date", ""))
+                if d is not None:
+                    dates.append(d)
+        if dates:
+            lo, hi = min(dates), max(dates)
+        self.record(path, rows, os.path.getsize(path), lo, hi, complete=True)
+
+    def rebuild(self) -> int:
+        """Scan the directory and (re)catalog every output file; returns the number of files.
+
+        Reads each file once to count rows and find the date range, so this
+        is the slow path for directories written before the catalog existed.
+        """
+        names = sorted(n for n in os.listdir(self.root) if parse_result_name(n))
+        for name in names:
+            self._scan(name)
+        with self._lock:
+            stale = [r[0] for r in self._db.execute("SELECT name FROM files")
+                     if not os.path.exists(os.path.join(self.root, r[0]))]
+        for name in stale:
+            self.remove(name)
+        return len(names)
+
+    def sync(self, prefix: str = "") -> Tuple[List[str], List[str]]:
+        """Compare the entries starting with `prefix` with the directory listing.
+
+        Output files without an entry (copied in, or written before the
+        catalog existed) are scanned and added. Entries of finished crawls
+        whose file is gone are reported but kept (use `rebuild` to drop them);
+        unfinished parquet crawls have no file yet and are not reported.
+
+        Returns:
+            tuple: (names added, names of finished entries with no file)
+        """
+        entries = self.entries(prefix)
+        known = {entry["name"] for entry in entries}
+        added = sorted(n for n in os.listdir(self.root)
+                       if n.startswith(prefix) and parse_result_name(n) and n not in known)
+        for name in added:
+            self._scan(name)
+        gone = [entry["name"] for entry in entries
+                if entry["complete"] and not os.path.exists(os.path.join(self.root, entry["name"]))]
+        return added, gone
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
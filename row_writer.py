@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming output sink for crawled rows
+
+Rows are appended to the output file(s) in batches instead of being kept
+in memory until the end of the crawl, so memory stays flat and the partial
+output can be read while the crawl is running.
+- CSV: UTF-8-SIG, columns date, title, source, contents, link
+- JSON Lines (optional): same path with a .jsonl extension
+- Parquet (optional, needs pyarrow): rows are staged as JSON Lines while
+  crawling and converted to a zstd-compressed Parquet file with a typed
+  `date` column when the writer is closed
+- Date helpers shared by the merger, the text cleanser and the article
+  store: crawled date text to dates (absolute and relative), vectorized
+  over pandas columns
+"""
+
+import csv
+import datetime
+import functools
+import json
+import os
+import re
+import sys
+from typing import Dict, Iterator, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency, only needed for parquet output
+    pa = pq = None
+
+COLUMNS = ['date', 'title', 'source', 'contents', 'link']
+OUTPUT_FORMATS = ("csv", "parquet")
+
+_DATE = re.compile(r"(\d{4})\.(\d{1,2})\.(\d{1,2})")
+
+
+def parse_date(text: str) -> Optional[datetime.date]:
+    """Parse a crawled "YYYY.MM.DD." date; None for relative or missing dates."""
+    m = _DATE.search(text or '')
+    if not m:
+        return None
+    try:
+        return datetime.date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+    except ValueError:
+        return None
+
+
+_ABSOLUTE_DATE = re.compile(r"(\d{4})\s*[.\-/]\s*(\d{1,2})\s*[.\-/]\s*(\d{1,2})")
+_RELATIVE_DATE = re.compile(r"(\d+)\s*(초|분|시간|일|주)\s*전")
+_RELATIVE_UNITS = {'초': 'seconds', '분': 'minutes', '시간': 'hours', '일': 'days', '주': 'weeks'}
+
+
+@functools.lru_cache(maxsize=65536)
+def parse_date_text(text: str):
+    """Parse one distinct crawled date string (cached: a quarter has only a few hundred).
+
+    Returns:
+        date for absolute dates ("2022.03.23."), timedelta for relative ones
+        ("3시간 전", "어제"), or None if the text is not a date.
+    """
+    m = _ABSOLUTE_DATE.search(text)
+    if m:
+        try:
+            return datetime.date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            return None
+    m = _RELATIVE_DATE.search(text)
+    if m:
+        return datetime.timedelta(**{_RELATIVE_UNITS[m.group(2)]: int(m.group(1))})
+    if '어제' in text:
+        return datetime.timedelta(days=1)
+    return None
+
+
+def parse_dates(dates: pd.Series, reference: Optional[datetime.datetime] = None) -> pd.Series:
+    """Convert crawled dates ("2022.03.23." text, or typed dates from Parquet) to datetimes.
+
+    The column is factorized once and only its distinct values are parsed.
+    Relative dates ("3시간 전") are resolved against `reference`, the time
+    the file was crawled; without it, and for malformed dates, the result is NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    codes, uniques = pd.factorize(dates)
+    parsed = []
+    for value in uniques:
+        if isinstance(value, datetime.datetime):
+            value = value.date()
+        elif not isinstance(value, datetime.date):
+            value = parse_date_text(str(value))
+            if isinstance(value, datetime.timedelta):
+                value = (reference - value).date() if reference is not None else None
+        parsed.append(value)
+    lookup = np.append(pd.to_datetime(pd.Series(parsed, dtype=object)).to_numpy(dtype='datetime64[ns]'),
+                       np.datetime64('NaT'))
+    # code -1 (missing value) picks the trailing NaT
+    return pd.Series(lookup[codes], index=dates.index, name=dates.name)
+
+
+def format_dates(dates: pd.Series) -> pd.Series:
+    """Format datetimes as "YYYY.MM.DD." text (NaT -> NaN), formatting each distinct day once."""
+    codes, uniques = pd.factorize(dates)
+    lookup = np.append(np.asarray(uniques.strftime('%Y.%m.%d.'), dtype=object), np.nan)
+    return pd.Series(lookup[codes], index=dates.index, name=dates.name)
+
+
+def crawl_time(path: str) -> datetime.datetime:
+    """When a result file was crawled: its last write time (the crawler streams rows until it finishes)."""
+    return datetime.datetime.fromtimestamp(os.path.getmtime(path))
+
+
+def parquet_schema():
+    return pa.schema([
+        ('date', pa.date32()),
+        ('title', pa.string()),
+        ('source', pa.string()),
+        ('contents', pa.string()),
+        ('link', pa.string()),
+    ])
+
+
+def require_pyarrow() -> None:
+    if pa is None:
+        raise SystemExit("parquet 형식을 사용하려면 pyarrow가 필요합니다: pip install pyarrow")
+
+
+def read_csv_rows(path: str) -> Iterator[dict]:
+    """Stream rows of a crawler CSV as dicts (article bodies can exceed csv's default field limit)."""
+    csv.field_size_limit(sys.maxsize)
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def _iter_jsonl_batches(path: str, batch_size: int) -> Iterator[List[dict]]:
+    batch: List[dict] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def jsonl_to_parquet(jsonl_path: str, parquet_path: str, batch_size: int = 1000) -> None:
+    """Convert staged JSON Lines rows to Parquet one row group per batch."""
+    require_pyarrow()
+    schema = parquet_schema()
+    tmp = parquet_path + ".tmp"
+    with pq.ParquetWriter(tmp, schema, compression="zstd") as writer:
+        for batch in _iter_jsonl_batches(jsonl_path, batch_size):
+            columns = {col: [row.get(col, '') for row in batch] for col in COLUMNS}
+            columns['date'] = [parse_date(d) for d in columns['date']]
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+    os.replace(tmp, parquet_path)
+
+
+class RowWriter:
+    """Append rows to CSV or Parquet (and optionally JSON Lines) in batches.
+
+    Args:
+        path (str): Output path; a .parquet extension selects Parquet output.
+        jsonl (bool): Also keep a JSON Lines copy next to the output.
+        batch_size (int): Rows buffered before they are written out.
+        offsets (dict): Byte sizes to truncate existing outputs to before
+            appending (from a checkpoint). None starts new files.
+
+    The range of (absolute) dates written is kept in `date_min`/`date_max`;
+    for a resumed writer it only covers the rows written since resuming.
+    """
+
+    def __init__(self, path: str, jsonl: bool = False, batch_size: int = 100,
+                 offsets: Optional[Dict[str, int]] = None, rows_written: int = 0):
+        self.output_path = path
+        self.parquet = path.endswith(".parquet")
+        self.keep_jsonl = jsonl
+        self.paths = {}
+        if self.parquet:
+            require_pyarrow()
+        else:
+            self.paths["csv"] = path
+        if jsonl or self.parquet:
+            self.paths["jsonl"] = os.path.splitext(path)[0] + ".jsonl"
+        self.batch_size = max(1, batch_size)
+        self.rows_written = rows_written
+        self.resumed = offsets is not None
+        self.date_min: Optional[datetime.date] = None
+        self.date_max: Optional[datetime.date] = None
+        self._buffer: List[dict] = []
+        self._files = {}
+        for fmt, path in self.paths.items():
+            if offsets is not None and fmt in offsets and os.path.exists(path):
+                f = open(path, "r+b")
+                f.truncate(offsets[fmt])
+                f.close()
+                self._files[fmt] = open(path, "a", encoding="utf-8", newline="")
+            else:
+                # utf-8-sig writes the BOM once at the start of a new file
+                self._files[fmt] = open(path, "w", encoding="utf-8-sig" if fmt == "csv" else "utf-8",
+                                        newline="")
+                if fmt == "csv":
+                    csv.writer(self._files[fmt]).writerow(COLUMNS)
+        self._csv = csv.writer(self._files["csv"]) if "csv" in self._files else None
+        self.flush()
+
+    @property
+    def path(self) -> str:
+        return self.output_path
+
+    def write_rows(self, rows: List[dict]) -> None:
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        for row in self._buffer:
+            d = parse_date(row.get('date', ''))
+            if d is not None:
+                self.date_min = d if self.date_min is None else min(self.date_min, d)
+                self.date_max = d if self.date_max is None else max(self.date_max, d)
+            if self._csv is not None:
+                self._csv.writerow([row.get(col, '') for col in COLUMNS])
+            if "jsonl" in self._files:
+                record = {col: row.get(col, '') for col in COLUMNS}
+                self._files["jsonl"].write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+        for f in self._files.values():
+            f.flush()
+
+    def written_links(self) -> Set[str]:
+        """Links of the rows already in the output (e.g. kept from before a resume)."""
+        self.flush()
+        if "jsonl" in self.paths:
+            with open(self.paths["jsonl"], encoding="utf-8") as f:
+                links = {json.loads(line)["link"] for line in f}
+        else:
+            links = {row["link"] for row in read_csv_rows(self.paths["csv"])}
+        links.discard("")
+        return links
+
+    def offsets(self) -> Dict[str, int]:
+        """Byte size of each output after the last flush."""
+        return {fmt: os.fstat(f.fileno()).st_size for fmt, f in self._files.items()}
+
+    def close(self) -> None:
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        if self.parquet:
+            jsonl_path = self.paths["jsonl"]
+            jsonl_to_parquet(jsonl_path, self.output_path, max(self.batch_size, 1000))
+            if not self.keep_jsonl:
+                os.remove(jsonl_path)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""All parser backends must extract the same rows and article bodies."""
+
+import pytest
+
+import naver_stub
+from html_parsers import BACKENDS, get_backend
+
+ARTICLE = ('<html><body><div class="newsct_article _article_body">\n'
+           '  가 <b> 나</b>\n\n  <span>다 </span><br/>  <p>  </p>라<!-- 주석 -->\n'
+           '</div></body></html>')
+
+
+def _backends():
+    backends = []
+    for name in BACKENDS:
+        try:
+            backends.append(get_backend(name))
+        except SystemExit:  # backend not installed
+            pass
+    return backends
+
+
+@pytest.mark.parametrize("html", [
+    ARTICLE,
+    naver_stub.article_page(naver_stub.StubConfig(), "001", "0000000001"),
+    "<html><body><p>본문 없음</p></body></html>",
+], ids=["inline", "stub", "missing"])
+def test_article_bodies_match(html):
+    bodies = {backend.name: backend.article_body(html) for backend in _backends()}
+    assert len(set(bodies.values())) == 1, bodies
+
+
+def test_article_body_spacing():
+    for backend in _backends():
+        assert backend.article_body(ARTICLE) == "가 나 다 라", backend.name
+
+
+def test_news_rows_match():
+    html = naver_stub.search_page(naver_stub.StubConfig(results=30), "q", 1)
+    rows = {backend.name: backend.news_rows(html) for backend in _backends()}
+    first = next(iter(rows.values()))
+    assert first
+    assert all(r == first for r in rows.values()), rows
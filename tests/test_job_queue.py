@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Lease handling of the SQLite job queue."""
+
+import time
+
+import pytest
+
+import main
+from job_queue import JobQueue, LeaseKeeper, LeaseLost
+
+LEASE = 0.3
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = JobQueue(str(tmp_path / "queue.sqlite"), lease=LEASE)
+    q.enqueue("키워드", "2024.01.01", "2024.03.31")
+    yield q
+    q.close()
+
+
+def test_keeper_renews_owned_lease(queue):
+    job = queue.lease("a")
+    with LeaseKeeper(queue, job, "a") as keeper:
+        time.sleep(LEASE * 1.5)
+        keeper.check()  # renewed in the background, still owned
+    assert queue.lease("b") is None
+
+
+def test_check_raises_after_takeover(queue):
+    job = queue.lease("a")
+    time.sleep(LEASE * 1.2)
+    assert queue.lease("b").id == job.id  # expired lease taken over
+    with LeaseKeeper(queue, job, "a") as keeper:
+        time.sleep(LEASE / 2)  # first renewal fails
+        assert keeper.lost.is_set()
+        with pytest.raises(LeaseLost):
+            keeper.check()
+
+
+def test_check_raises_once_lease_ran_out(queue):
+    job = queue.lease("a")
+    keeper = LeaseKeeper(queue, job, "a")  # never started: no renewals
+    time.sleep(LEASE * 1.2)
+    with pytest.raises(LeaseLost):
+        keeper.check()
+
+
+def test_worker_abandons_job_with_lost_lease(queue, monkeypatch):
+    calls, failed = [], []
+
+    def run_job(q, job, maxpage, workers, lease):
+        calls.append(job.attempts)
+        if len(calls) == 1:
+            # another worker takes the job over while this one is crawling
+            q._write(lambda db: db.execute("UPDATE jobs SET owner = 'b' WHERE id = ?", (job.id,)))
+            time.sleep(LEASE / 2)
+            lease.check()
+            raise AssertionError("page written without the lease")
+        return "out.csv"
+
+    monkeypatch.setattr(main, "run_job", run_job)
+    monkeypatch.setattr(queue, "fail", lambda *args: failed.append(args))
+    assert main.run_worker(queue, 1, 1, owner="a", poll=0.05) == 1
+    assert calls == [1, 2]  # retried once b's lease ran out
+    assert not failed
+    assert queue.counts()["done"] == 1
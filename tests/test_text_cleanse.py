@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Boilerplate removal of text_cleanse.clean_contents."""
+
+import pandas as pd
+import pytest
+
+import naver_stub
+from html_parsers import get_backend
+from text_cleanse import clean_contents
+
+
+def clean(text: str) -> str:
+    return clean_contents(pd.Series([text]))[0]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("[서울=연합뉴스] 홍길동 기자 = 정부가 발표했다.", "정부가 발표했다."),
+    ("정부가 발표했다. 홍길동 기자", "정부가 발표했다."),
+    ("정부가 발표했다. (끝) 홍길동 기자", "정부가 발표했다. (끝)"),
+    ("정부가 발표했다. [정리] 김철수 이영희 기자", "정부가 발표했다. [정리]"),
+    ("정부가 발표했다. (hong@yna.co.kr)", "정부가 발표했다."),
+    ("정부가 발표했다. 저작권자 ⓒ 연합뉴스, 무단 전재 및 재배포 금지", "정부가 발표했다."),
+    ("정부가 발표했다. 무단 전재 및 재배포 금지", "정부가 발표했다."),
+])
+def test_boilerplate_removed(text, expected):
+    assert clean(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "저작권자 단체는 이번 개정안에 반대했다.",
+    "정부가 발표했다고 현장을 취재한 홍길동 기자",
+])
+def test_article_text_kept(text):
+    assert clean(text) == text
+
+
+def test_stub_article_byline_after_paragraph_marker():
+    html = naver_stub.article_page(naver_stub.StubConfig(article_paragraphs=2), "001", "0000000001")
+    body = get_backend("auto").article_body(html)
+    assert body.endswith("(0000000001-1) 홍길동 기자 (reporter@press.example.com)")
+    assert clean(body).endswith("계획이다. (0000000001-1)")